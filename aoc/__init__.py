@@ -0,0 +1,5 @@
+"""
+Tooling shared between the daily solutions: a runner that times every day,
+and the helpers it is built on. Run `python -m aoc --help` from the root of
+the repository for the available commands.
+"""
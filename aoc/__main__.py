@@ -0,0 +1,271 @@
+import argparse
+import sys
+from typing import List
+
+from aoc import runner
+from aoc.days import available_days
+
+
+def parse_days(selection: List[str]) -> List[int]:
+    """
+    Days can be given one by one or as ranges, e.g: `1 3 5-9`. No selection
+    means every available day.
+    """
+    if not selection:
+        return available_days()
+
+    days = set()
+    for item in selection:
+        if "-" in item:
+            start, end = item.split("-")
+            days.update(range(int(start), int(end) + 1))
+        else:
+            days.add(int(item))
+
+    unknown = days - set(available_days())
+    if unknown:
+        raise SystemExit(f"unknown day(s): {sorted(unknown)}")
+
+    return sorted(days)
+
+
+def cmd_run(args: argparse.Namespace):
+    timings = runner.run(
+        parse_days(args.days),
+        trace_memory=not args.no_memory,
+        use_cache=args.cache,
+        jobs=args.jobs,
+        use_memo=args.memo,
+    )
+    if args.format == "json":
+        print(runner.to_json(timings))
+    else:
+        print(runner.to_table(timings))
+
+
+def cmd_memo(args: argparse.Namespace):
+    from aoc.memo import ResultStore
+
+    store = ResultStore()
+    if args.clear:
+        store.clear()
+
+    stats = store.stats()
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / lookups if lookups else 0
+    print(f"entries: {stats['entries']} / {stats['max_entries']}")
+    print(f"hits: {stats['hits']}, misses: {stats['misses']} ({hit_rate:.0%} hits)")
+
+
+def cmd_profile(args: argparse.Namespace):
+    from aoc.instrument import profile
+
+    profiler = profile(parse_days(args.days), trace_memory=args.memory)
+    if args.format == "pstats":
+        output = args.output or "aoc.prof"
+        profiler.dump_stats(output)
+        print(f"wrote {output}, read it with: python -m pstats {output}")
+    elif args.format == "collapsed":
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(profiler.to_collapsed())
+        else:
+            sys.stdout.write(profiler.to_collapsed())
+    else:
+        print(profiler.to_table())
+
+
+def cmd_importtime(args: argparse.Namespace):
+    from aoc import importtime
+
+    results = importtime.import_times(parse_days(args.days), args.runs)
+    print(importtime.to_table(results))
+    if importtime.failures(results):
+        raise SystemExit("some modules are over their import time budget")
+
+
+def cmd_footprint(args: argparse.Namespace):
+    from aoc import footprint
+
+    print(footprint.to_table(footprint.footprints(parse_days(args.days), args.count)))
+
+
+def cmd_generate(args: argparse.Namespace):
+    from aoc.generators import generate
+
+    sys.stdout.write(generate(args.day, args.scale, args.seed))
+
+
+def cmd_bench(args: argparse.Namespace):
+    from aoc import bench, history
+
+    results = bench.bench(parse_days(args.days), args.scales, args.seed)
+    baseline = bench.load_baseline()
+    print(bench.to_table(results, baseline, args.tolerance))
+    if not args.no_history:
+        run = history.record(results, args.seed)
+        print(f"recorded as run {run}, see: python -m aoc compare")
+
+    if args.update_baseline:
+        bench.save_baseline(results)
+    elif bench.regressions(results, baseline, args.tolerance):
+        raise SystemExit("some days scale worse than their baseline")
+
+
+def cmd_compare(args: argparse.Namespace):
+    from aoc import history
+
+    entries = history.load()
+    if args.list:
+        for run, commit in history.runs(entries):
+            print(run, commit)
+        return
+
+    try:
+        changes = history.compare(
+            entries, args.base, args.head, args.threshold, args.confidence
+        )
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    print(history.to_table(changes, args.confidence))
+    if history.regressions(changes):
+        raise SystemExit("some stages got slower, or use more memory")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="aoc")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run and time the selected days")
+    run.add_argument("days", nargs="*", help="e.g: 1 3 5-9 (default: all)")
+    run.add_argument("--format", choices=["table", "json"], default="table")
+    run.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="don't trace the peak memory, which makes the timings more accurate",
+    )
+    run.add_argument(
+        "--cache",
+        action="store_true",
+        help="load the parsed inputs from the on-disk cache, if they are cached",
+    )
+    run.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="run the days/parts on this many processes (0: one per CPU core)",
+    )
+    run.add_argument(
+        "--memo",
+        action="store_true",
+        help="reuse the stored answers of earlier runs on the same input",
+    )
+    run.set_defaults(func=cmd_run)
+
+    memo = commands.add_parser("memo", help="inspect or clear the stored answers")
+    memo.add_argument("--clear", action="store_true")
+    memo.set_defaults(func=cmd_memo)
+
+    prof = commands.add_parser(
+        "profile", help="count and time the calls of the hot functions"
+    )
+    prof.add_argument("days", nargs="*", help="e.g: 1 3 5-9 (default: all)")
+    prof.add_argument(
+        "--format",
+        choices=["table", "collapsed", "pstats"],
+        default="table",
+        help="collapsed: stacks for flamegraph.pl, pstats: a cProfile stats file",
+    )
+    prof.add_argument("-o", "--output", help="the file to write to")
+    prof.add_argument(
+        "--memory",
+        action="store_true",
+        help="record the memory allocated by each function (a lot slower)",
+    )
+    prof.set_defaults(func=cmd_profile)
+
+    imp = commands.add_parser(
+        "importtime", help="check the import time of the selected days"
+    )
+    imp.add_argument("days", nargs="*", help="e.g: 1 3 5-9 (default: all)")
+    imp.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="import each module this many times and keep the fastest",
+    )
+    imp.set_defaults(func=cmd_importtime)
+
+    foot = commands.add_parser(
+        "footprint", help="measure the bytes per record of the record types"
+    )
+    foot.add_argument("days", nargs="*", help="e.g: 1 3 5-9 (default: all)")
+    foot.add_argument(
+        "--count", type=int, default=100_000, help="the number of records to build"
+    )
+    foot.set_defaults(func=cmd_footprint)
+
+    gen = commands.add_parser("generate", help="print a generated input")
+    gen.add_argument("day", type=int)
+    gen.add_argument("--scale", type=float, default=1)
+    gen.add_argument("--seed", type=int, default=0)
+    gen.set_defaults(func=cmd_generate)
+
+    bench_cmd = commands.add_parser(
+        "bench", help="fit how the selected days scale with the input size"
+    )
+    bench_cmd.add_argument("days", nargs="*", help="e.g: 1 3 5-9 (default: all)")
+    bench_cmd.add_argument(
+        "--scales",
+        nargs="+",
+        type=float,
+        help="input sizes relative to the puzzle input (default: per day)",
+    )
+    bench_cmd.add_argument("--seed", type=int, default=0)
+    bench_cmd.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.3,
+        help="how much an exponent may grow before the benchmark fails",
+    )
+    bench_cmd.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="record the fitted exponents as the new baseline",
+    )
+    bench_cmd.add_argument(
+        "--no-history",
+        action="store_true",
+        help="don't append the results to the benchmark history",
+    )
+    bench_cmd.set_defaults(func=cmd_bench)
+
+    compare = commands.add_parser(
+        "compare", help="compare two benchmark runs from the history"
+    )
+    compare.add_argument(
+        "base", nargs="?", help="a run id or commit (default: the second to last run)"
+    )
+    compare.add_argument(
+        "head", nargs="?", help="a run id or commit (default: the last run)"
+    )
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="the smallest relative change that is flagged",
+    )
+    compare.add_argument("--confidence", type=float, default=0.95)
+    compare.add_argument(
+        "--list", action="store_true", help="list the runs in the history"
+    )
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
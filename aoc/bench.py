@@ -0,0 +1,214 @@
+"""
+Scaling benchmarks for all days.
+
+Each day is run on generated inputs of increasing size (its ladder of scales,
+see aoc.generators), and we fit the empirical complexity exponent k of every
+stage, i.e the k in: time ~ size^k. The exponents are compared against the
+ones recorded in bench_baseline.json, and a stage fails when it scales
+super-linearly worse than it used to, i.e when its exponent has grown by more
+than the tolerance above both its baseline and 1. Stages that still scale
+(sub-)linearly never fail, which keeps the noise of the very fast stages from
+failing the suite.
+"""
+import gc
+import json
+import math
+import sys
+import tempfile
+from collections import namedtuple
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from aoc.days import DAYS, load_day
+from aoc.generators import generate
+from aoc.runner import measure, solve
+
+BASELINE_PATH = Path(__file__).parent / "bench_baseline.json"
+
+# The scales that each day is benchmarked on. The slow days get a ladder of
+# smaller inputs to keep the whole suite running in a few minutes.
+LADDERS: Dict[int, Tuple[float, ...]] = {
+    1: (4, 16, 64),
+    2: (4, 16, 64),
+    3: (1, 4, 16),
+    4: (1, 4, 16),
+    5: (1, 4, 16),
+    6: (4, 16, 64),
+    7: (0.1, 0.25, 0.5),
+    8: (1, 4, 16),
+    9: (1, 4, 16),
+    10: (1, 4, 16),
+    11: (1, 4, 16),
+    12: (4, 16, 64),
+    13: (1, 4, 16),
+    14: (4, 16, 64),
+    15: (0.05, 0.1, 0.2),
+    16: (1, 4, 16),
+}
+
+# The fitted scaling of one stage of a day, with the input sizes (in bytes)
+# and the best time (in seconds) for each scale of the ladder. trials holds
+# the times of all the runs, and peaks the peak memory (in bytes), of each
+# scale.
+Scaling = namedtuple(
+    "Scaling",
+    ["day", "stage", "scales", "sizes", "times", "exponent", "trials", "peaks"],
+)
+
+
+def trials(
+    fn, *args, min_total: float = 0.2, min_runs: int = 5, max_runs: int = 20
+) -> List[float]:
+    """
+    Runs fn(*args) at least min_runs times, and more until we have spent at
+    least min_total seconds on it (or ran it max_runs times). Returns the
+    time of every run, so that aoc.history can compare runs statistically.
+    The first run warms up the caches and isn't counted.
+    """
+    measure(fn, *args, trace_memory=False)
+    times: List[float] = []
+    while len(times) < min_runs or (
+        sum(times) < min_total and len(times) < max_runs
+    ):
+        # start each run without the garbage of the previous one
+        gc.collect()
+        _, wall, _, _ = measure(fn, *args, trace_memory=False)
+        times.append(wall)
+
+    return times
+
+
+def peak_memory(fn, *args) -> int:
+    _, _, _, peak = measure(fn, *args, trace_memory=True)
+    return peak
+
+
+def fit_exponent(sizes: Sequence[float], times: Sequence[float]) -> float:
+    """
+    The slope of the least squares line through the (log size, log time)
+    points.
+    """
+    xs = [math.log(s) for s in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in times]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    var = sum((x - mean_x) ** 2 for x in xs)
+    return cov / var
+
+
+def bench_day(
+    day: int, scales: Optional[Sequence[float]] = None, seed: int = 0
+) -> List[Scaling]:
+    module = load_day(day)
+    spec = DAYS[day]
+    scales = scales or LADDERS[day]
+    stages = ["parse"] + [f"part {i}" for i in range(1, len(spec.parts) + 1)]
+    sizes = []
+    runs: Dict[str, List[List[float]]] = {stage: [] for stage in stages}
+    peaks: Dict[str, List[int]] = {stage: [] for stage in stages}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            path = Path(tmp) / f"day{day}_{scale}.txt"
+            path.write_text(generate(day, scale, seed))
+            sizes.append(path.stat().st_size)
+
+            parsed = spec.parse(module, path)
+            fns = [partial(spec.parse, module, path)] + [
+                partial(solve, part, module, parsed, **params)
+                for part, params in zip(spec.parts, spec.params)
+            ]
+            for stage, fn in zip(stages, fns):
+                runs[stage].append(trials(fn))
+                peaks[stage].append(peak_memory(fn))
+
+    results = []
+    for stage in stages:
+        # taking the fastest run filters out most of the noise of the fast
+        # stages
+        times = [min(t) for t in runs[stage]]
+        exponent = fit_exponent(sizes, times)
+        results.append(
+            Scaling(
+                day,
+                stage,
+                list(scales),
+                sizes,
+                times,
+                exponent,
+                runs[stage],
+                peaks[stage],
+            )
+        )
+    return results
+
+
+def bench(
+    days: List[int], scales: Optional[Sequence[float]] = None, seed: int = 0
+) -> List[Scaling]:
+    # Some of the solutions recurse once per packet/path, which goes past
+    # the default recursion limit on the larger inputs.
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 ** 5))
+
+    results = []
+    for day in days:
+        results += bench_day(day, scales, seed)
+    return results
+
+
+def _key(s: Scaling) -> str:
+    return f"{s.day}.{s.stage}"
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, float]:
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(results: List[Scaling], path: Path = BASELINE_PATH):
+    baseline = load_baseline(path)
+    baseline.update({_key(s): round(s.exponent, 3) for s in results})
+    with open(path, "w") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write("\n")
+
+
+def regressions(
+    results: List[Scaling], baseline: Dict[str, float], tolerance: float
+) -> List[Scaling]:
+    return [
+        s
+        for s in results
+        if _key(s) in baseline and s.exponent > max(baseline[_key(s)], 1) + tolerance
+    ]
+
+
+def to_table(
+    results: List[Scaling], baseline: Dict[str, float], tolerance: float
+) -> str:
+    from prettytable import PrettyTable
+
+    failed = {_key(s) for s in regressions(results, baseline, tolerance)}
+    table = PrettyTable()
+    table.field_names = [
+        "day", "stage", "sizes (KiB)", "times (ms)", "exponent", "baseline", ""
+    ]
+    table.align = "r"
+    table.align["stage"] = "l"
+    for s in results:
+        table.add_row(
+            [
+                s.day,
+                s.stage,
+                " ".join(f"{size / 1024:.1f}" for size in s.sizes),
+                " ".join(f"{t * 1000:.2f}" for t in s.times),
+                f"{s.exponent:.2f}",
+                baseline.get(_key(s), "-"),
+                "FAIL" if _key(s) in failed else "",
+            ]
+        )
+
+    return table.get_string()
@@ -0,0 +1,192 @@
+"""
+An on-disk cache of parsed inputs.
+
+The first time a day parses an input, we store its parsed form as a set of
+.npy arrays in a .cache folder next to the input. Later runs on the same
+input load those arrays instead of tokenizing the text again. The days whose
+parsed form is made of the arrays themselves (2 to 5) memory map them, the
+others read them into memory, as they turn them into other objects anyway.
+
+An entry is keyed by the day, a hash of the input's content, a hash of the
+day's source (see aoc.days.source_digest, which covers parse_input and the aoc
+modules it imports, like aoc/grid.py) and the version of that day's codec. So
+it is invalidated whenever the input or the parser changes, or when a codec's
+version is bumped. Bump the version whenever the codec itself changes.
+
+Only the days that have a codec are cached. The others (8, 10, 12 and 14)
+parse into strings, dicts or graphs that don't map well to arrays, and are
+always parsed from the text.
+"""
+import os
+import shutil
+from collections import namedtuple
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from aoc.days import input_digest, source_digest
+from aoc.grid import Grid
+
+# encode turns the parsed form of a day into named arrays, and decode takes
+# the day's module and those arrays and returns the parsed form again. mmap
+# tells whether decode keeps the arrays, so that they are worth mapping.
+Codec = namedtuple("Codec", ["version", "encode", "decode", "mmap"], defaults=[False])
+
+Arrays = Dict[str, np.ndarray]
+
+
+def _grid_to_tuples(arr: np.ndarray) -> tuple:
+    return tuple(map(tuple, arr.tolist()))
+
+
+_ints = Codec(
+    1,
+    lambda parsed: {"values": np.array(parsed, dtype=np.int64)},
+    lambda m, a: tuple(a["values"].tolist()),
+)
+
+_grid = Codec(
+    2,
+    lambda parsed: {"grid": parsed.cells.astype(np.uint8)},
+    lambda m, a: Grid(a["grid"]).freeze(),
+)
+
+
+def _encode_day13(parsed) -> Arrays:
+    points, fold_ops = parsed
+    return {
+        "points": np.array(points, dtype=np.int64).reshape(-1, 2),
+        "dims": np.array([ord(op.dim) for op in fold_ops], dtype=np.uint8),
+        "positions": np.array([op.pos for op in fold_ops], dtype=np.int64),
+    }
+
+
+def _decode_day13(m: ModuleType, a: Arrays):
+    points = tuple(m.Point(x, y) for x, y in a["points"].tolist())
+    fold_ops = tuple(
+        m.FoldOp(chr(dim), pos)
+        for dim, pos in zip(a["dims"].tolist(), a["positions"].tolist())
+    )
+    return points, fold_ops
+
+
+CODECS: Dict[int, Codec] = {
+    1: _ints,
+    2: Codec(
+        2,
+        lambda parsed: parsed._asdict(),
+        lambda m, a: m.Course(a["directions"], a["dists"]),
+        mmap=True,
+    ),
+    3: Codec(
+        2,
+        lambda parsed: {
+            "readings": parsed.readings,
+            "width": np.array([parsed.width]),
+        },
+        lambda m, a: m.Report(a["readings"], int(a["width"][0])),
+        mmap=True,
+    ),
+    4: Codec(
+        2,
+        lambda parsed: {"nums": parsed[0], "boards": parsed[1]},
+        lambda m, a: (a["nums"], a["boards"]),
+        mmap=True,
+    ),
+    5: Codec(
+        2, lambda parsed: {"lines": parsed}, lambda m, a: a["lines"], mmap=True
+    ),
+    6: _ints,
+    7: _ints,
+    9: Codec(
+        2,
+        lambda parsed: {
+            "matrix": parsed.matrix.cells.astype(np.uint8),
+            "low_points": np.array(parsed.low_points, dtype=np.int64).reshape(-1, 2),
+        },
+        lambda m, a: m.Heightmap(
+            Grid(a["matrix"], fill=m.BORDER).freeze(),
+            _grid_to_tuples(a["low_points"]),
+        ),
+    ),
+    11: Codec(
+        3,
+        _grid.encode,
+        lambda m, a: Grid(a["grid"], fill=m.BORDER).freeze(),
+    ),
+    13: Codec(1, _encode_day13, _decode_day13),
+    15: _grid,
+    16: Codec(
+        1,
+        lambda parsed: {"bits": np.frombuffer(parsed.encode(), dtype=np.uint8)},
+        lambda m, a: a["bits"].tobytes().decode(),
+    ),
+}
+
+
+def _prefix(day: int, path: Path) -> str:
+    return f"day{day:02d}-{Path(path).name}"
+
+
+def entry_dir(day: int, path: Path) -> Path:
+    """
+    The folder that holds the cached arrays for the current content of the
+    input at path, parsed by the current source of the day and the current
+    version of its codec.
+    """
+    digests = f"{input_digest(path)[:16]}-{source_digest(day)[:8]}"
+    key = f"{digests}-v{CODECS[day].version}"
+    return Path(path).parent / ".cache" / f"{_prefix(day, path)}-{key}"
+
+
+def load(day: int, module: ModuleType, entry: Path) -> Optional[Any]:
+    """
+    Returns the parsed form cached in entry, or None if it hasn't been
+    cached yet.
+    """
+    if not entry.is_dir():
+        return None
+
+    codec = CODECS[day]
+    mmap_mode = "r" if codec.mmap else None
+    arrays = {p.stem: np.load(p, mmap_mode=mmap_mode) for p in entry.glob("*.npy")}
+    return codec.decode(module, arrays)
+
+
+def store(day: int, parsed: Any, path: Path, entry: Path):
+    """
+    Writes the entry to a temporary folder first and renames it when it's
+    complete, so a concurrent or interrupted run never sees half an entry.
+    Older entries for the same input are removed.
+    """
+    entry.parent.mkdir(exist_ok=True)
+    for stale in entry.parent.glob(f"{_prefix(day, path)}-*"):
+        if stale != entry and ".tmp" not in stale.name:
+            shutil.rmtree(stale, ignore_errors=True)
+
+    tmp = entry.with_name(f"{entry.name}.tmp{os.getpid()}")
+    tmp.mkdir()
+    for name, arr in CODECS[day].encode(parsed).items():
+        np.save(tmp / f"{name}.npy", arr)
+
+    try:
+        tmp.rename(entry)
+    except OSError:  # someone else stored it first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def parse_cached(
+    day: int, module: ModuleType, path: Path, parse: Callable[[ModuleType, Path], Any]
+) -> Any:
+    if day not in CODECS:
+        return parse(module, path)
+
+    entry = entry_dir(day, path)
+    parsed = load(day, module, entry)
+    if parsed is None:
+        parsed = parse(module, path)
+        store(day, parsed, path, entry)
+
+    return parsed
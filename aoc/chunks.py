@@ -0,0 +1,50 @@
+"""
+Splitting large inputs into chunks of whole lines, for the days that can
+solve their input chunk by chunk: either streaming, in constant memory, or
+in parallel, on a process pool.
+"""
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Tuple
+
+
+def iter_chunks(f: BinaryIO, chunk_size: int = 2 ** 24) -> Iterator[bytes]:
+    """
+    Reads f (a file opened in binary mode, or sys.stdin.buffer) chunk by
+    chunk. Every chunk ends with a complete line: the partial line at the end
+    of a read is carried over to the next chunk.
+    """
+    rest = b""
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            break
+        data = rest + data
+        end = data.rfind(b"\n") + 1
+        rest = data[end:]
+        if end:
+            yield data[:end]
+
+    if rest.strip():
+        yield rest
+
+
+def chunk_bounds(path: Path, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Splits the file into byte ranges of about chunk_size bytes, each of
+    which ends right after a newline, so that no line is split.
+    """
+    size = path.stat().st_size
+    bounds = [0]
+    with open(path, "rb") as f:
+        while bounds[-1] + chunk_size < size:
+            f.seek(bounds[-1] + chunk_size)
+            f.readline()
+            bounds.append(f.tell())
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def read_chunk(path: Path, start: int, end: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start)
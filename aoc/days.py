@@ -0,0 +1,135 @@
+import hashlib
+import re
+import sys
+import importlib.util
+from pathlib import Path
+from collections import namedtuple
+from types import ModuleType
+from typing import Dict, List
+
+ROOT = Path(__file__).parent.parent
+
+# How to call a day's solution. `parse` takes the loaded module and the path to
+# an input file and returns the parsed input, every entry of `parts` takes the
+# module and that parsed input and returns the answer. Every day parses its
+# input once, into a form that the parts don't modify, so the parts can share
+# it. `params` holds the keyword arguments that each part is called with.
+Day = namedtuple("Day", ["parse", "parts", "params"], defaults=[({}, {})])
+
+_loaded: Dict[int, ModuleType] = {}
+
+# An import of a module of the aoc package, e.g "from aoc.grid import Grid".
+_AOC_IMPORT = re.compile(rb"^\s*(?:from|import)\s+aoc\.(\w+)", re.MULTILINE)
+
+
+def _parse(m: ModuleType, path: Path):
+    return m.parse_input(path)
+
+
+_PARTS = (
+    lambda m, c, **kw: m.part_1(c, **kw),
+    lambda m, c, **kw: m.part_2(c, **kw),
+)
+
+# for the days whose parts take the parsed input as separate arguments
+_UNPACKED = (
+    lambda m, c, **kw: m.part_1(*c, **kw),
+    lambda m, c, **kw: m.part_2(*c, **kw),
+)
+
+DAYS: Dict[int, Day] = {
+    1: Day(_parse, _PARTS),
+    2: Day(_parse, _PARTS),
+    3: Day(_parse, _PARTS),
+    4: Day(_parse, _UNPACKED),
+    5: Day(_parse, _PARTS),
+    6: Day(_parse, _PARTS),
+    7: Day(_parse, _PARTS),
+    8: Day(_parse, _PARTS),
+    9: Day(_parse, _PARTS),
+    10: Day(_parse, _PARTS),
+    11: Day(_parse, _PARTS, ({"n": 100}, {"n": 300})),
+    12: Day(_parse, _PARTS),
+    13: Day(_parse, _UNPACKED),
+    14: Day(_parse, _UNPACKED, ({"num_iter": 10}, {"num_iter": 40})),
+    15: Day(_parse, _PARTS, ({}, {"n": 5})),
+    16: Day(_parse, _PARTS),
+}
+
+
+def input_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_files(day: int) -> List[Path]:
+    """
+    The source files that a day runs: the modules of its folder, and the
+    modules of the aoc package that they import (e.g aoc/grid.py), found by
+    scanning their imports.
+    """
+    files = set((ROOT / f"day{day:02d}").glob("*.py"))
+    todo = list(files)
+    while todo:
+        for name in _AOC_IMPORT.findall(todo.pop().read_bytes()):
+            path = ROOT / "aoc" / f"{name.decode()}.py"
+            if path.exists() and path not in files:
+                files.add(path)
+                todo.append(path)
+    return sorted(files)
+
+
+def source_digest(day: int) -> str:
+    """
+    A hash of the source of a day, including the helper modules next to it
+    and the modules of the aoc package that it imports.
+    """
+    h = hashlib.sha256()
+    for path in source_files(day):
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def input_path(day: int) -> Path:
+    return ROOT / f"day{day:02d}" / "input.txt"
+
+
+def available_days() -> List[int]:
+    return sorted(
+        day for day in DAYS if (ROOT / f"day{day:02d}" / f"day{day}.py").exists()
+    )
+
+
+def load_day(day: int) -> ModuleType:
+    """
+    Imports dayNN/dayN.py the same way running it as a script would, i.e with
+    its own folder first on sys.path so that the helper modules next to it
+    (point.py, graph.py, ...) can be imported.
+    Some of those helpers share their name with other modules (day16/ast.py
+    shadows the standard library's ast), so we hide any module with the same
+    name while the day is imported, and put the original back afterwards.
+    """
+    if day in _loaded:
+        return _loaded[day]
+
+    folder = ROOT / f"day{day:02d}"
+    path = folder / f"day{day}.py"
+    helpers = {p.stem for p in folder.glob("*.py")} - {path.stem}
+    hidden = {name: sys.modules.pop(name) for name in helpers if name in sys.modules}
+
+    sys.path.insert(0, str(folder))
+    try:
+        spec = importlib.util.spec_from_file_location(f"day{day:02d}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(folder))
+        for name in helpers:
+            sys.modules.pop(name, None)
+        sys.modules.update(hidden)
+
+    _loaded[day] = module
+    return module
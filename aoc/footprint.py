@@ -0,0 +1,164 @@
+"""
+Memory footprint of the record types of the days.
+
+Some days build one object per line, or per cell (the Points of day 5, the
+Fish of day 6, ...). On large inputs, the per-object overhead of those records
+dominates the memory of the day, so they are slotted classes: they don't get
+a __dict__ per instance.
+
+For every record type, we build `count` records while tracing the allocated
+memory, and report the bytes per record, everything included (the object,
+its fields and its slot in the list that holds them). The "before" column
+measures the same records built from the type as it was before it was
+slotted: the same class without its __slots__, or, for the types whose
+fields changed too (BingoBoard and Literal), a copy of the original class.
+"""
+import gc
+import importlib.util
+import tracemalloc
+from collections import defaultdict, namedtuple
+from typing import Callable, Dict, List, Tuple
+
+from aoc.days import ROOT, load_day
+
+Footprint = namedtuple("Footprint", ["day", "record", "slotted", "before"])
+
+
+def _load_helper(day: int, name: str):
+    """
+    Imports a helper module of a day that the day itself doesn't expose.
+    """
+    path = ROOT / f"day{day:02d}" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(f"day{day:02d}_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _unslotted(cls) -> type:
+    """
+    The class without its __slots__, i.e with a __dict__ per instance.
+    """
+    slots = set(cls.__slots__) | {"__slots__", "__dict__", "__weakref__"}
+    namespace = {k: v for k, v in vars(cls).items() if k not in slots}
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+class _Literal:
+    """
+    Literal before it was slotted: it kept the bits of its packet, and
+    decoded its value on every call.
+    """
+
+    def __init__(self, packet: str):
+        self.header = packet[:6]
+        self.body = packet[6:]
+
+
+class _BingoBoard:
+    """
+    BingoBoard before it counted its marks: it kept a map from every number
+    to its position (a defaultdict), and a 2D-list of the marked positions.
+    """
+
+    def __init__(self, board: List[List[int]]):
+        self.board = board
+        self.num_to_coordinate = defaultdict(tuple)
+        for i, row in enumerate(board):
+            for j, num in enumerate(row):
+                self.num_to_coordinate[num] = (i, j)
+        self.boolean_board = [[False for _ in row] for row in board]
+
+
+def _board(i: int) -> List[List[int]]:
+    return [[(i + 5 * r + c) % 100 for c in range(5)] for r in range(5)]
+
+
+def _packet(i: int) -> str:
+    # a literal packet with the value i % 256, in two groups of 4 bits
+    return f"{i % 8:03b}100" + f"1{(i >> 4) % 16:04b}" + f"0{i % 16:04b}"
+
+
+# day -> (record name, the type, the type before it was slotted (given the
+# type), and a factory: (type, i) -> the i-th record)
+RECORDS: Dict[int, Tuple[str, Callable, Callable, Callable]] = {
+    2: (
+        "Movement",
+        lambda: load_day(2).Movement,
+        _unslotted,
+        lambda cls, i: cls(("forward", "down", "up")[i % 3], i % 10),
+    ),
+    4: (
+        "BingoBoard",
+        lambda: _load_helper(4, "bingo_board").BingoBoard,
+        lambda cls: _BingoBoard,
+        lambda cls, i: cls(_board(i)),
+    ),
+    5: (
+        "Point",
+        lambda: load_day(5).Point,
+        _unslotted,
+        lambda cls, i: cls([str(i % 1000), str(i // 1000 % 1000)]),
+    ),
+    6: (
+        "Fish",
+        lambda: load_day(6).Fish,
+        _unslotted,
+        lambda cls, i: cls(i % 9, i % 2),
+    ),
+    16: (
+        "Literal",
+        lambda: load_day(16).Literal,
+        lambda cls: _Literal,
+        lambda cls, i: cls(_packet(i)),
+    ),
+}
+
+
+def bytes_per_record(cls, factory: Callable, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        records = [factory(cls, i) for i in range(count)]
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del records
+    return current / count
+
+
+def footprint(day: int, count: int = 100_000) -> Footprint:
+    name, get_type, get_before, factory = RECORDS[day]
+    cls = get_type()
+    return Footprint(
+        day,
+        name,
+        bytes_per_record(cls, factory, count),
+        bytes_per_record(get_before(cls), factory, count),
+    )
+
+
+def footprints(days: List[int], count: int = 100_000) -> List[Footprint]:
+    return [footprint(day, count) for day in days if day in RECORDS]
+
+
+def to_table(results: List[Footprint]) -> str:
+    from prettytable import PrettyTable
+
+    table = PrettyTable()
+    table.field_names = ["day", "record", "bytes/record", "before", "saved"]
+    table.align = "r"
+    table.align["record"] = "l"
+    for r in results:
+        table.add_row(
+            [
+                r.day,
+                r.record,
+                f"{r.slotted:.0f}",
+                f"{r.before:.0f}",
+                f"{1 - r.slotted / r.before:.0%}",
+            ]
+        )
+
+    return table.get_string()
@@ -0,0 +1,300 @@
+"""
+Seeded generators for synthetic puzzle inputs.
+
+Every generator takes a random.Random instance and a scale, and returns the
+text of an input file in the same format as that day's input.txt. A scale of
+1 gives an input of roughly the same size as the puzzle input, a scale of 10
+one that is about 10 times larger, etc. The same (day, scale, seed) always
+gives the same input.
+"""
+import math
+import random
+from typing import Callable, Dict, List
+
+
+def _count(base: int, scale: float) -> int:
+    return max(1, round(base * scale))
+
+
+def _side(base: int, scale: float) -> int:
+    """
+    The side of a square grid with `scale` times as many cells as a
+    (base x base) grid.
+    """
+    return max(2, round(base * math.sqrt(scale)))
+
+
+def day01(rng: random.Random, scale: float) -> str:
+    depth = rng.randint(100, 200)
+    depths = []
+    for _ in range(_count(2000, scale)):
+        depth = max(0, depth + rng.randint(-10, 12))
+        depths.append(str(depth))
+    return "\n".join(depths) + "\n"
+
+
+def day02(rng: random.Random, scale: float) -> str:
+    directions = ["forward", "down", "up"]
+    moves = [
+        f"{rng.choice(directions)} {rng.randint(1, 9)}"
+        for _ in range(_count(1000, scale))
+    ]
+    return "\n".join(moves) + "\n"
+
+
+def day03(rng: random.Random, scale: float) -> str:
+    """
+    part_2 assumes that every number is unique, so we make the numbers wide
+    enough to have plenty of unique values to sample from.
+    """
+    n = _count(1000, scale)
+    width = max(12, n.bit_length() + 2)
+    nums = rng.sample(range(2 ** width), n)
+    return "\n".join(format(num, f"0{width}b") for num in nums) + "\n"
+
+
+def day04(rng: random.Random, scale: float) -> str:
+    draws = list(range(100))
+    rng.shuffle(draws)
+    boards = []
+    for _ in range(_count(100, scale)):
+        nums = rng.sample(range(100), 25)
+        rows = [" ".join(f"{n:>2}" for n in nums[i : i + 5]) for i in range(0, 25, 5)]
+        boards.append("\n".join(rows))
+    return ",".join(map(str, draws)) + "\n\n" + "\n\n".join(boards) + "\n"
+
+
+def day05(rng: random.Random, scale: float) -> str:
+    """
+    An equal share of horizontal, vertical and diagonal lines in a 1000 x 1000
+    plane, like the puzzle input.
+    """
+    lines = []
+    for i in range(_count(500, scale)):
+        x1, y1 = rng.randrange(1000), rng.randrange(1000)
+        length = rng.randint(1, 500)
+        kind = i % 3
+        if kind == 0:
+            x2, y2 = min(999, x1 + length), y1
+        elif kind == 1:
+            x2, y2 = x1, min(999, y1 + length)
+        else:
+            dy = rng.choice([-1, 1])
+            length = min(length, 999 - x1, y1 if dy == -1 else 999 - y1)
+            x2, y2 = x1 + length, y1 + dy * length
+        lines.append(f"{x1},{y1} -> {x2},{y2}")
+    return "\n".join(lines) + "\n"
+
+
+def day06(rng: random.Random, scale: float) -> str:
+    return ",".join(str(rng.randint(1, 5)) for _ in range(_count(300, scale)))
+
+
+def day07(rng: random.Random, scale: float) -> str:
+    """
+    The positions stay within the same range as the puzzle input, so the
+    amount of work grows with the number of crabs.
+    """
+    return ",".join(str(rng.randint(0, 1900)) for _ in range(_count(1000, scale)))
+
+
+# The segments that are on for each digit, see day08.pattern_to_num_map.
+_SEGMENTS = [
+    "abcefg", "cf", "acdeg", "acdfg", "bcdf",
+    "abdfg", "abdefg", "acf", "abcdefg", "abcdfg",
+]
+
+
+def day08(rng: random.Random, scale: float) -> str:
+    rows = []
+    for _ in range(_count(200, scale)):
+        wires = list("abcdefg")
+        rng.shuffle(wires)
+        wiring = dict(zip("abcdefg", wires))
+
+        def scramble(digit: int) -> str:
+            pattern = [wiring[s] for s in _SEGMENTS[digit]]
+            rng.shuffle(pattern)
+            return "".join(pattern)
+
+        digits = list(range(10))
+        rng.shuffle(digits)
+        signals = " ".join(scramble(d) for d in digits)
+        output = " ".join(scramble(rng.randrange(10)) for _ in range(4))
+        rows.append(f"{signals} | {output}")
+    return "\n".join(rows) + "\n"
+
+
+def day09(rng: random.Random, scale: float) -> str:
+    side = _side(100, scale)
+    rows = ["".join(rng.choice("0123456789") for _ in range(side)) for _ in range(side)]
+    return "\n".join(rows) + "\n"
+
+
+def _brackets(rng: random.Random, length: int) -> List[str]:
+    """
+    A random sequence of balanced brackets, at least `length` long.
+    """
+    pairs = {"(": ")", "[": "]", "{": "}", "<": ">"}
+    chars, stack = [], []
+    while len(chars) < length or stack:
+        if stack and (len(chars) >= length or rng.random() < 0.45):
+            chars.append(pairs[stack.pop()])
+        else:
+            opening = rng.choice(list(pairs))
+            stack.append(opening)
+            chars.append(opening)
+    return chars
+
+
+def day10(rng: random.Random, scale: float) -> str:
+    """
+    Half of the lines are corrupted by swapping one of the closing brackets
+    for a wrong one, the other half are incomplete.
+    """
+    closing = ")]}>"
+    rows = []
+    for i in range(_count(90, scale)):
+        chars = _brackets(rng, rng.randint(60, 110))
+        if i % 2 == 0:
+            positions = [j for j, c in enumerate(chars) if c in closing]
+            j = rng.choice(positions)
+            chars[j] = rng.choice([c for c in closing if c != chars[j]])
+        else:
+            openings = [j for j, c in enumerate(chars) if c not in closing]
+            chars = chars[: rng.choice(openings[len(openings) // 2 :]) + 1]
+        rows.append("".join(chars))
+    return "\n".join(rows) + "\n"
+
+
+def day11(rng: random.Random, scale: float) -> str:
+    side = _side(10, scale)
+    rows = ["".join(rng.choice("0123456789") for _ in range(side)) for _ in range(side)]
+    return "\n".join(rows) + "\n"
+
+
+def day12(rng: random.Random, scale: float) -> str:
+    """
+    The number of paths grows exponentially with the size of a connected cave
+    system. To get inputs that grow linearly, we connect a number of small,
+    separate cave systems to the same start and end. Big caves are never
+    connected to each other, which would lead to infinitely many paths.
+    """
+    edges = []
+    for i in range(_count(3, scale)):
+        edges += [
+            f"start-A{i}",
+            f"start-b{i}",
+            f"A{i}-c{i}",
+            f"A{i}-b{i}",
+            f"b{i}-d{i}",
+            f"A{i}-end",
+            f"b{i}-end",
+        ]
+    rng.shuffle(edges)
+    return "\n".join(edges) + "\n"
+
+
+def day13(rng: random.Random, scale: float) -> str:
+    """
+    There can't be any dots on the fold lines. So we place the dots on the
+    final, folded paper, and then unfold it again, mirroring each dot across
+    the fold line half of the time.
+    """
+    width, height = 1311, 895
+    folds = []
+    while width > 40 or height > 6:
+        if width > 40:
+            width //= 2
+            folds.append(("x", width))
+        if height > 6:
+            height //= 2
+            folds.append(("y", height))
+
+    points = set()
+    for _ in range(_count(800, scale)):
+        x, y = rng.randrange(width), rng.randrange(height)
+        for dim, pos in reversed(folds):
+            if rng.random() < 0.5:
+                if dim == "x":
+                    x = 2 * pos - x
+                else:
+                    y = 2 * pos - y
+        points.add((x, y))
+
+    rows = [f"{x},{y}" for x, y in sorted(points)]
+    fold_ops = [f"fold along {dim}={pos}" for dim, pos in folds]
+    return "\n".join(rows) + "\n\n" + "\n".join(fold_ops) + "\n"
+
+
+def day14(rng: random.Random, scale: float) -> str:
+    letters = "BCFHKNOPSV"
+    polymer = "".join(rng.choice(letters) for _ in range(_count(20, scale)))
+    rules = [f"{a}{b} -> {rng.choice(letters)}" for a in letters for b in letters]
+    return polymer + "\n\n" + "\n".join(rules) + "\n"
+
+
+def day15(rng: random.Random, scale: float) -> str:
+    side = _side(100, scale)
+    rows = ["".join(rng.choice("123456789") for _ in range(side)) for _ in range(side)]
+    return "\n".join(rows) + "\n"
+
+
+def _literal(rng: random.Random) -> str:
+    value = format(rng.randrange(1, 2 ** 12), "012b")
+    groups = [value[i : i + 4] for i in range(0, 12, 4)]
+    body = "".join(("1" if i < 2 else "0") + g for i, g in enumerate(groups))
+    return format(rng.randrange(8), "03b") + "100" + body
+
+
+def _operator(rng: random.Random, type_id: int, children: List[str]) -> str:
+    header = format(rng.randrange(8), "03b") + format(type_id, "03b")
+    body = "".join(children)
+    if rng.random() < 0.5 and len(body) < 2 ** 15:
+        return header + "0" + format(len(body), "015b") + body
+    return header + "1" + format(len(children), "011b") + body
+
+
+def _packet(rng: random.Random, depth: int) -> str:
+    if depth == 0 or rng.random() < 0.3:
+        return _literal(rng)
+
+    type_id = rng.choice([0, 1, 2, 3, 5, 6, 7])
+    num_children = 2 if type_id >= 5 else rng.randint(1, 3)
+    children = [_packet(rng, depth - 1) for _ in range(num_children)]
+    return _operator(rng, type_id, children)
+
+
+def day16(rng: random.Random, scale: float) -> str:
+    """
+    A sum over a number of random expressions, encoded as a hexadecimal
+    transmission.
+    """
+    children = [_packet(rng, 3) for _ in range(min(2047, _count(60, scale)))]
+    bits = _operator(rng, 0, children)
+    bits += "0" * (-len(bits) % 4)
+    return "".join(format(int(bits[i : i + 4], 2), "X") for i in range(0, len(bits), 4))
+
+
+GENERATORS: Dict[int, Callable[[random.Random, float], str]] = {
+    1: day01,
+    2: day02,
+    3: day03,
+    4: day04,
+    5: day05,
+    6: day06,
+    7: day07,
+    8: day08,
+    9: day09,
+    10: day10,
+    11: day11,
+    12: day12,
+    13: day13,
+    14: day14,
+    15: day15,
+    16: day16,
+}
+
+
+def generate(day: int, scale: float = 1, seed: int = 0) -> str:
+    return GENERATORS[day](random.Random(seed), scale)
@@ -0,0 +1,113 @@
+"""
+A 2D grid of integers, shared by the grid days (5, 9, 11, 13 and 15).
+
+The cells are stored in one contiguous ndarray, surrounded by a border of
+`pad` cells that hold `fill`. The border means that the neighbours of every
+cell exist, so the hot loops never have to check the bounds: they only have
+to choose a fill that their condition rejects (e.g a height that is never
+lower than its neighbours).
+
+There are two ways to work with a grid:
+- in bulk, on `cells` (a view of the inside of the grid) and on the shifted
+  views returned by `neighbours`, which line up each cell with one of its
+  neighbours.
+- one cell at a time, on the flat index of a cell in the padded grid. The
+  neighbours of index i are i + offset for the offsets in `offsets_4` or
+  `offsets_8`, and `values()` returns the padded grid as a flat list, as
+  indexing a list is a lot faster than indexing an ndarray one entry at a
+  time.
+"""
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# (row, col) offsets of the neighbours of a cell: up, right, down, left.
+OFFSETS_4 = ((-1, 0), (0, 1), (1, 0), (0, -1))
+# and with the diagonal neighbours, clockwise from the top left.
+OFFSETS_8 = (
+    (-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1)
+)
+
+
+class Grid:
+    def __init__(
+        self,
+        cells: Sequence[Sequence[int]],
+        pad: int = 1,
+        fill: int = 0,
+        dtype=np.int64,
+    ):
+        cells = np.asarray(cells, dtype=dtype)
+        self.rows, self.cols = cells.shape
+        self.pad = pad
+        self.fill = fill
+        self.data = np.full((self.rows + 2 * pad, self.cols + 2 * pad), fill, dtype)
+        self.data[pad : pad + self.rows, pad : pad + self.cols] = cells
+
+        width = self.cols + 2 * pad
+        self.offsets_4 = tuple(r * width + c for r, c in OFFSETS_4)
+        self.offsets_8 = tuple(r * width + c for r, c in OFFSETS_8)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], pad: int = 1, fill: int = 0) -> "Grid":
+        """
+        A grid of single digits, one row per line.
+        """
+        rows = [line.strip() for line in lines]
+        rows = [row for row in rows if row]
+        digits = np.frombuffer("".join(rows).encode(), dtype=np.uint8) - ord("0")
+        return cls(digits.reshape(len(rows), -1), pad, fill)
+
+    @classmethod
+    def zeros(cls, rows: int, cols: int, pad: int = 1, dtype=np.int64) -> "Grid":
+        return cls(np.zeros((rows, cols), dtype), pad, 0, dtype)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.rows, self.cols
+
+    @property
+    def cells(self) -> np.ndarray:
+        """
+        The inside of the grid, without the border. Writing to it writes to
+        the grid.
+        """
+        return self.shifted(0, 0)
+
+    def shifted(self, dr: int, dc: int) -> np.ndarray:
+        """
+        A view with the same shape as `cells`, where each cell holds the value
+        of its (dr, dc) neighbour, or the fill for the cells on the border.
+        """
+        p = self.pad
+        return self.data[p + dr : p + dr + self.rows, p + dc : p + dc + self.cols]
+
+    def neighbours(self, diagonal: bool = False) -> List[np.ndarray]:
+        return [self.shifted(r, c) for r, c in (OFFSETS_8 if diagonal else OFFSETS_4)]
+
+    def index(self, r: int, c: int) -> int:
+        """
+        The flat index of the cell (r, c) in the padded grid.
+        """
+        return (r + self.pad) * (self.cols + 2 * self.pad) + c + self.pad
+
+    def position(self, i: int) -> Tuple[int, int]:
+        r, c = divmod(i, self.cols + 2 * self.pad)
+        return r - self.pad, c - self.pad
+
+    def values(self) -> list:
+        return self.data.ravel().tolist()
+
+    def copy(self) -> "Grid":
+        grid = Grid.__new__(Grid)
+        grid.__dict__.update(self.__dict__)
+        grid.data = self.data.copy()
+        return grid
+
+    def freeze(self) -> "Grid":
+        """
+        Makes the grid read-only, e.g for parsed inputs that are shared by
+        both parts. Use copy() to get a grid that can be written to again.
+        """
+        self.data.setflags(write=False)
+        return self
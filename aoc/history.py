@@ -0,0 +1,335 @@
+"""
+A local history of the benchmark runs, and statistical comparisons between
+them.
+
+Every `python -m aoc bench` appends one record per (day, stage, scale) to
+HISTORY_PATH: the input size, the time of every trial, the peak memory, and
+the commit that was benchmarked (with a -dirty suffix when the tree had
+uncommitted changes). All the records of one bench share the same run id:
+the time of the run, and a random suffix that tells apart the runs that
+started within the same second.
+
+compare() lines up the stages of two selections of runs (a run id, or a
+commit, which pools all the runs of that commit, leaving out the runs of a
+dirty tree unless the commit is given with its -dirty suffix). Only the inputs generated
+with the same seed are compared. For each stage, we take the
+difference between the mean log times of the trials, and its confidence
+interval (Welch's t-interval, which doesn't assume that both sides have the
+same variance). Working with log times turns that difference into a ratio
+of the times. A stage is slower (or faster) only when the whole confidence
+interval of the ratio is above 1 + threshold (or below 1 - threshold), so
+that neither noise nor tiny but consistent changes get flagged. Stages that
+take less than MIN_SECONDS are too noisy to tell either way, and are never
+flagged.
+
+The trials of one run share the state of the machine, so the interval of a
+single run is usually too narrow. Benchmarking each side more than once, and
+comparing commits rather than runs, gives more trustworthy results.
+"""
+import json
+import math
+import statistics
+import subprocess
+import time
+import uuid
+from collections import defaultdict, namedtuple
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from aoc.days import ROOT
+
+HISTORY_PATH = ROOT / ".cache" / "bench_history.jsonl"
+
+MIN_SECONDS = 0.001
+
+# The suffix of the commit of a run whose tree had uncommitted changes.
+DIRTY = "-dirty"
+
+# The comparison of one (day, stage, scale, seed) between two selections of
+# runs. ratio and ci are head / base times, the peaks are in bytes.
+Change = namedtuple(
+    "Change",
+    [
+        "day",
+        "stage",
+        "scale",
+        "seed",
+        "size",
+        "base_mean",
+        "head_mean",
+        "ratio",
+        "ci",
+        "base_peak",
+        "head_peak",
+        "verdict",
+    ],
+)
+
+
+def current_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+    return f"{commit}{DIRTY}" if status.strip() else commit
+
+
+def record(results: list, seed: int, path: Path = HISTORY_PATH) -> str:
+    """
+    Appends the results of a bench (a list of aoc.bench.Scaling) to the
+    history, and returns the id of the run.
+    """
+    run = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    commit = current_commit()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        for s in results:
+            stats = zip(s.scales, s.sizes, s.trials, s.peaks)
+            for scale, size, trials, peak in stats:
+                entry = {
+                    "run": run,
+                    "commit": commit,
+                    "day": s.day,
+                    "stage": s.stage,
+                    "scale": scale,
+                    "seed": seed,
+                    "size": size,
+                    "times": trials,
+                    "peak_memory": peak,
+                }
+                f.write(json.dumps(entry) + "\n")
+
+    return run
+
+
+def load(path: Path = HISTORY_PATH) -> List[dict]:
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def runs(entries: List[dict]) -> List[Tuple[str, str]]:
+    """
+    The (run id, commit) of every run, oldest first.
+    """
+    seen = {}
+    for e in entries:
+        seen.setdefault(e["run"], e["commit"])
+    return list(seen.items())
+
+
+def resolve_commit(revision: str) -> Optional[str]:
+    """
+    The abbreviated commit of a git revision, e.g HEAD~1, or None if git
+    doesn't know it.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", f"{revision}^{{commit}}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def is_commit(commit: str, selector: str) -> bool:
+    """
+    Whether the commit of a run is the (abbreviated) commit selector. The
+    runs of a dirty tree ran different code than the commit, so they only
+    match a selector with the -dirty suffix, and the clean runs only one
+    without it.
+    """
+    dirty = commit.endswith(DIRTY)
+    if dirty != selector.endswith(DIRTY):
+        return False
+    if dirty:
+        commit, selector = commit[: -len(DIRTY)], selector[: -len(DIRTY)]
+    return commit.startswith(selector)
+
+
+def select(entries: List[dict], selector: str) -> List[dict]:
+    """
+    The entries of a run id, or of all the runs of a commit (the commit can
+    be abbreviated, or any revision that git understands, and ends with
+    -dirty to select the runs of a dirty tree).
+    """
+    selected = [e for e in entries if e["run"] == selector]
+    if not selected:
+        selected = [e for e in entries if is_commit(e["commit"], selector)]
+    if not selected:
+        dirty = selector.endswith(DIRTY)
+        commit = resolve_commit(selector[: -len(DIRTY)] if dirty else selector)
+        if commit:
+            commit += DIRTY if dirty else ""
+            selected = [e for e in entries if is_commit(e["commit"], commit)]
+    if not selected:
+        raise ValueError(f"no run or commit matches {selector!r}")
+    return selected
+
+
+def t_quantile(p: float, df: float) -> float:
+    """
+    The p quantile of Student's t distribution with df degrees of freedom,
+    from the Cornish-Fisher expansion around the normal quantile. It is
+    within 1% of the exact value from 3 degrees of freedom on.
+    """
+    z = statistics.NormalDist().inv_cdf(p)
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    g4 = (
+        79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z
+    ) / 92160
+    return z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+
+
+def ratio_interval(
+    base: List[float], head: List[float], confidence: float
+) -> Tuple[float, Tuple[float, float]]:
+    """
+    The ratio of the geometric mean times of head and base, and its
+    confidence interval.
+    """
+    xs = [math.log(max(t, 1e-9)) for t in base]
+    ys = [math.log(max(t, 1e-9)) for t in head]
+    diff = statistics.fmean(ys) - statistics.fmean(xs)
+    if len(xs) < 2 or len(ys) < 2:
+        return math.exp(diff), (0.0, math.inf)
+
+    vx = statistics.variance(xs) / len(xs)
+    vy = statistics.variance(ys) / len(ys)
+    se = math.sqrt(vx + vy)
+    if se == 0:
+        return math.exp(diff), (math.exp(diff), math.exp(diff))
+
+    # Welch-Satterthwaite
+    df = (vx + vy) ** 2 / (vx ** 2 / (len(xs) - 1) + vy ** 2 / (len(ys) - 1))
+    margin = t_quantile(1 - (1 - confidence) / 2, df) * se
+    return math.exp(diff), (math.exp(diff - margin), math.exp(diff + margin))
+
+
+def _group(entries: List[dict]) -> Dict[tuple, List[dict]]:
+    groups = defaultdict(list)
+    for e in entries:
+        groups[(e["day"], e["stage"], e["scale"], e["seed"])].append(e)
+    return groups
+
+
+def compare(
+    entries: List[dict],
+    base: Optional[str] = None,
+    head: Optional[str] = None,
+    threshold: float = 0.1,
+    confidence: float = 0.95,
+) -> List[Change]:
+    """
+    Compares the stages that were benchmarked in both base and head, which
+    default to the second to last and the last run.
+    """
+    all_runs = runs(entries)
+    if (base is None or head is None) and len(all_runs) < 2:
+        raise ValueError("the history needs at least two runs to compare")
+    base = base or all_runs[-2][0]
+    head = head or all_runs[-1][0]
+
+    base_groups = _group(select(entries, base))
+    head_groups = _group(select(entries, head))
+    changes = []
+    for key in sorted(base_groups.keys() & head_groups.keys()):
+        old, new = base_groups[key], head_groups[key]
+        old_times = [t for e in old for t in e["times"]]
+        new_times = [t for e in new for t in e["times"]]
+        ratio, ci = ratio_interval(old_times, new_times, confidence)
+        old_peak = max(e["peak_memory"] for e in old)
+        new_peak = max(e["peak_memory"] for e in new)
+
+        old_mean, new_mean = statistics.fmean(old_times), statistics.fmean(new_times)
+        verdict = ""
+        if max(old_mean, new_mean) < MIN_SECONDS:
+            pass
+        elif ci[0] > 1 + threshold:
+            verdict = "slower"
+        elif ci[1] < 1 - threshold:
+            verdict = "faster"
+        if new_peak > old_peak * (1 + threshold) + 1024:
+            verdict = f"{verdict}, more memory" if verdict else "more memory"
+
+        changes.append(
+            Change(
+                *key,
+                new[-1]["size"],
+                old_mean,
+                new_mean,
+                ratio,
+                ci,
+                old_peak,
+                new_peak,
+                verdict,
+            )
+        )
+
+    return changes
+
+
+def regressions(changes: List[Change]) -> List[Change]:
+    return [
+        c for c in changes if "slower" in c.verdict or "more memory" in c.verdict
+    ]
+
+
+def to_table(changes: List[Change], confidence: float = 0.95) -> str:
+    from prettytable import PrettyTable
+
+    table = PrettyTable()
+    table.field_names = [
+        "day",
+        "stage",
+        "scale",
+        "seed",
+        "size (KiB)",
+        "base (ms)",
+        "head (ms)",
+        "change",
+        f"{confidence:.0%} CI",
+        "peak (KiB)",
+        "",
+    ]
+    table.align = "r"
+    table.align["stage"] = "l"
+    table.align[""] = "l"
+    for c in changes:
+        table.add_row(
+            [
+                c.day,
+                c.stage,
+                c.scale,
+                c.seed,
+                f"{c.size / 1024:.1f}",
+                f"{c.base_mean * 1000:.2f}",
+                f"{c.head_mean * 1000:.2f}",
+                f"{c.ratio - 1:+.1%}",
+                f"{c.ci[0] - 1:+.1%} .. {c.ci[1] - 1:+.1%}",
+                f"{c.base_peak / 1024:.1f} -> {c.head_peak / 1024:.1f}",
+                c.verdict,
+            ]
+        )
+
+    return table.get_string()
@@ -0,0 +1,103 @@
+"""
+Import time benchmark.
+
+Starting a day (or the runner) shouldn't pay for libraries that only some of
+its code paths use. Each module is imported in a fresh interpreter, so that
+nothing is cached yet, and we time the import alone (not the interpreter's
+own start up). A module fails when its best import time is over its budget,
+or when it imports one of the HEAVY_MODULES eagerly: those have to be
+imported inside the functions that need them.
+"""
+import json
+import math
+import subprocess
+import sys
+from collections import namedtuple
+from typing import Dict, List
+
+from aoc.days import ROOT
+
+# Libraries that take tens of milliseconds to import.
+HEAVY_MODULES = ("numpy", "prettytable")
+
+# The budget (in milliseconds) of each module, the days get DEFAULT_BUDGET.
+DEFAULT_BUDGET = 25.0
+BUDGETS: Dict[str, float] = {
+    "aoc.__main__": 30.0,
+}
+
+ImportTime = namedtuple("ImportTime", ["module", "seconds", "budget", "heavy"])
+
+_SCRIPT = """
+import json, sys, time
+from aoc.days import load_day
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps([seconds, heavy]))
+"""
+
+
+def _statement(module: str) -> str:
+    if module.startswith("day"):
+        return f"load_day({int(module[3:])})"
+    return f"import {module}"
+
+
+def time_import(module: str, runs: int = 5) -> ImportTime:
+    """
+    Imports the module `runs` times, each time in a new interpreter, and
+    keeps the fastest import.
+    """
+    script = _SCRIPT.format(statement=_statement(module), heavy=HEAVY_MODULES)
+    best, heavy = math.inf, []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        seconds, heavy = json.loads(out)
+        best = min(best, seconds)
+
+    return ImportTime(
+        module, best, BUDGETS.get(module, DEFAULT_BUDGET), tuple(heavy)
+    )
+
+
+def modules(days: List[int]) -> List[str]:
+    return ["aoc.__main__"] + [f"day{day:02d}" for day in days]
+
+
+def import_times(days: List[int], runs: int = 5) -> List[ImportTime]:
+    return [time_import(module, runs) for module in modules(days)]
+
+
+def failures(results: List[ImportTime]) -> List[ImportTime]:
+    return [r for r in results if r.seconds * 1000 > r.budget or r.heavy]
+
+
+def to_table(results: List[ImportTime]) -> str:
+    from prettytable import PrettyTable
+
+    failed = set(failures(results))
+    table = PrettyTable()
+    table.field_names = ["module", "import (ms)", "budget (ms)", "heavy imports", ""]
+    table.align = "r"
+    table.align["module"] = "l"
+    table.align["heavy imports"] = "l"
+    for r in results:
+        table.add_row(
+            [
+                r.module,
+                f"{r.seconds * 1000:.2f}",
+                f"{r.budget:.0f}",
+                ", ".join(r.heavy),
+                "FAIL" if r in failed else "",
+            ]
+        )
+
+    return table.get_string()
@@ -0,0 +1,231 @@
+"""
+Opt-in instrumentation of the hot functions of the days.
+
+While a day is profiled, its known hot functions (HOT_FUNCTIONS), together
+with parse_input, part_1 and part_2, are replaced by wrappers that count the
+calls, and record the time spent in them (in total and in the function
+itself) and, when tracemalloc is tracing, how much memory they allocated.
+Recursive calls go through the same wrappers, as they look the function up
+in the module.
+
+The results can be exported as collapsed stacks (one line per call stack,
+with the time spent in microseconds), which flamegraph.pl, speedscope and
+the like can read, or as a cProfile stats file, which pstats, snakeviz, etc
+can read.
+"""
+import functools
+import marshal
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from aoc.days import load_day
+
+# The functions of each day that are worth instrumenting. Methods are given
+# as Class.method.
+HOT_FUNCTIONS: Dict[int, Tuple[str, ...]] = {
+    5: ("get_lines", "rasterize", "count_overlapping_lines"),
+    9: ("find_lowpoints", "get_valid_neighbours", "bfs"),
+    11: ("bfs", "is_all_zeroes"),
+    12: ("dfs_part1", "dfs_part2"),
+    13: ("to_paper", "fold_x", "fold_y"),
+    15: ("build_graph", "dijsktra", "Graph.neighbours", "Graph.add_edge"),
+    16: ("parse", "get_version_sum", "evaluate_ast"),
+}
+
+ROOT_FUNCTIONS = ("parse_input", "part_1", "part_2")
+
+# The same key as cProfile uses for a function: (filename, line, name).
+FunctionKey = Tuple[str, int, str]
+
+
+class FunctionStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.primitive_calls = 0  # calls that aren't recursive
+        self.total_time = 0.0  # includes the functions it calls
+        self.self_time = 0.0
+        self.allocated = 0  # net bytes, including the functions it calls
+        # caller -> [primitive calls, calls, self time, total time]
+        self.callers: Dict[FunctionKey, List[float]] = defaultdict(
+            lambda: [0, 0, 0.0, 0.0]
+        )
+
+
+class Profiler:
+    """
+    Keeps the stack of the instrumented functions that are currently running,
+    so that we can tell the time spent in a function itself apart from the
+    time spent in the instrumented functions it calls.
+    """
+
+    def __init__(self):
+        self.functions: Dict[FunctionKey, FunctionStats] = {}
+        self.collapsed: Dict[str, float] = defaultdict(float)
+        self._stack: List[list] = []
+        self._depth: Dict[FunctionKey, int] = defaultdict(int)
+
+    def wrap(self, fn: Callable, name: str) -> Callable:
+        code = fn.__code__
+        key = (code.co_filename, code.co_firstlineno, code.co_name)
+        self.functions.setdefault(key, FunctionStats(name))
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            self._enter(key)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._exit()
+
+        return wrapper
+
+    def _enter(self, key: FunctionKey):
+        allocated = 0
+        if tracemalloc.is_tracing():
+            allocated = tracemalloc.get_traced_memory()[0]
+        recursive = self._depth[key] > 0
+        self._depth[key] += 1
+        # key, start, time spent in instrumented children, memory, recursive
+        self._stack.append([key, time.perf_counter(), 0.0, allocated, recursive])
+
+    def _exit(self):
+        end = time.perf_counter()
+        key, start, child_time, allocated, recursive = self._stack.pop()
+        elapsed = end - start
+        self_time = elapsed - child_time
+        self._depth[key] -= 1
+
+        stats = self.functions[key]
+        stats.calls += 1
+        stats.self_time += self_time
+        if not recursive:
+            stats.primitive_calls += 1
+            stats.total_time += elapsed
+            if tracemalloc.is_tracing():
+                stats.allocated += tracemalloc.get_traced_memory()[0] - allocated
+
+        names = [self.functions[frame[0]].name for frame in self._stack]
+        self.collapsed[";".join(names + [stats.name])] += self_time
+
+        if self._stack:
+            parent = self._stack[-1]
+            parent[2] += elapsed
+            caller = stats.callers[parent[0]]
+            caller[0] += 0 if recursive else 1
+            caller[1] += 1
+            caller[2] += self_time
+            caller[3] += 0 if recursive else elapsed
+
+    def to_collapsed(self) -> str:
+        return "".join(
+            f"{stack} {round(seconds * 1e6)}\n"
+            for stack, seconds in sorted(self.collapsed.items())
+            if round(seconds * 1e6) > 0
+        )
+
+    def dump_stats(self, path: Path):
+        """
+        Writes the stats in the format that cProfile.Profile.dump_stats uses,
+        so they can be loaded with pstats.Stats(path).
+        """
+        stats = {
+            key: (
+                s.primitive_calls,
+                s.calls,
+                s.self_time,
+                s.total_time,
+                {caller: tuple(c) for caller, c in s.callers.items()},
+            )
+            for key, s in self.functions.items()
+            if s.calls
+        }
+        with open(path, "wb") as f:
+            marshal.dump(stats, f)
+
+    def to_table(self) -> str:
+        from prettytable import PrettyTable
+
+        table = PrettyTable()
+        table.field_names = [
+            "function", "calls", "total (ms)", "self (ms)", "alloc (KiB)"
+        ]
+        table.align = "r"
+        table.align["function"] = "l"
+        ranked = sorted(self.functions.values(), key=lambda s: -s.self_time)
+        for s in ranked:
+            if s.calls:
+                table.add_row(
+                    [
+                        s.name,
+                        s.calls,
+                        f"{s.total_time * 1000:.2f}",
+                        f"{s.self_time * 1000:.2f}",
+                        f"{s.allocated / 1024:.1f}",
+                    ]
+                )
+        return table.get_string()
+
+
+def _resolve(module: ModuleType, name: str) -> Tuple[object, str]:
+    """
+    Returns the object that holds the function (the module or a class) and
+    the attribute name of the function on it.
+    """
+    *owner_names, attr = name.split(".")
+    owner = module
+    for owner_name in owner_names:
+        owner = getattr(owner, owner_name)
+    return owner, attr
+
+
+@contextmanager
+def instrumented(day: int, profiler: Profiler) -> Iterator[ModuleType]:
+    """
+    Replaces the hot functions of the day by wrappers while in the context,
+    and puts the original functions back afterwards.
+    """
+    module = load_day(day)
+    originals = []
+    try:
+        for name in ROOT_FUNCTIONS + HOT_FUNCTIONS.get(day, ()):
+            owner, attr = _resolve(module, name)
+            # look methods up in the class' __dict__, to get the function
+            # itself rather than whatever the attribute lookup returns
+            if isinstance(owner, type):
+                fn = owner.__dict__[attr]
+            else:
+                fn = getattr(owner, attr)
+            originals.append((owner, attr, fn))
+            setattr(owner, attr, profiler.wrap(fn, f"day{day:02d}.{name}"))
+        yield module
+    finally:
+        for owner, attr, fn in reversed(originals):
+            setattr(owner, attr, fn)
+
+
+def profile(days: List[int], trace_memory: bool = False) -> Profiler:
+    """
+    Runs the days with their hot functions instrumented. With trace_memory,
+    tracemalloc is started so that the allocations are recorded as well,
+    which makes everything run a lot slower.
+    """
+    from aoc.runner import run_day
+
+    profiler = Profiler()
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        for day in days:
+            with instrumented(day, profiler):
+                run_day(day, trace_memory=False)
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    return profiler
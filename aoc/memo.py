@@ -0,0 +1,147 @@
+"""
+A persistent store of answers, so that solving the same (day, part) on the
+same input again returns immediately instead of recomputing it.
+
+An answer is keyed by the day, the part, the parameters the part is called
+with (e.g `n` for day 11) and a hash of the input. The key also includes a
+hash of the day's source (and of the aoc modules that it imports, like
+aoc/grid.py), so fixing a bug in a solution never returns the answers of the
+buggy version.
+
+The store is a small sqlite database that holds at most `max_entries`
+answers. When it grows past that, the least recently used answers are
+evicted.
+"""
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+from aoc.days import ROOT, input_digest, source_digest
+
+DEFAULT_PATH = ROOT / ".cache" / "results.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    answer TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS digests (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO stats VALUES ('hits', 0), ('misses', 0);
+"""
+
+
+class ResultStore:
+    """
+    The size bounded (LRU) store of answers. The hit and miss counts of this
+    instance are kept in `hits` and `misses`, the totals over all runs are
+    returned by stats().
+    """
+
+    def __init__(self, path: Path = DEFAULT_PATH, max_entries: int = 10_000):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        # WAL lets the processes of a parallel run read while one of them
+        # writes, and makes the commits cheap.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def file_digest(self, path: Path) -> str:
+        """
+        Hashing a large input takes a while, so we remember the digest of
+        each input until its size or modification time changes.
+        """
+        path = Path(path).resolve()
+        st = os.stat(path)
+        row = self.conn.execute(
+            "SELECT digest FROM digests WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (str(path), st.st_size, st.st_mtime_ns),
+        ).fetchone()
+        if row:
+            return row[0]
+
+        digest = input_digest(path)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?)",
+            (str(path), st.st_size, st.st_mtime_ns, digest),
+        )
+        return digest
+
+    def key(self, day: int, part: int, params: Dict[str, Any], path: Path) -> str:
+        params = sorted(params.items())
+        return json.dumps(
+            [day, part, params, self.file_digest(path), source_digest(day)]
+        )
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Returns (True, answer) if the answer is stored, and (False, None)
+        otherwise.
+        """
+        row = self.conn.execute(
+            "SELECT answer FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        found = row is not None
+        self.conn.execute(
+            "UPDATE stats SET value = value + 1 WHERE name = ?",
+            ("hits" if found else "misses",),
+        )
+        if not found:
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        self.conn.execute(
+            "UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key)
+        )
+        return True, json.loads(row[0])
+
+    def put(self, key: str, answer: Any):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+            (key, json.dumps(answer), time.time()),
+        )
+        self._evict()
+
+    def _evict(self):
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        if count > self.max_entries:
+            self.conn.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def stats(self) -> Dict[str, int]:
+        stats = dict(self.conn.execute("SELECT name, value FROM stats"))
+        (stats["entries"],) = self.conn.execute(
+            "SELECT COUNT(*) FROM results"
+        ).fetchone()
+        stats["max_entries"] = self.max_entries
+        return stats
+
+    def clear(self):
+        self.conn.execute("DELETE FROM results")
+        self.conn.execute("DELETE FROM digests")
+        self.conn.execute("UPDATE stats SET value = 0")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,302 @@
+import io
+import json
+import os
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aoc.days import DAYS, ROOT, input_path, load_day
+
+# One measured stage of a day: "parse", "part 1" or "part 2".
+Timing = namedtuple(
+    "Timing", ["day", "stage", "wall", "cpu", "peak_memory", "answer"]
+)
+
+# How long each (day, part) took on the puzzle input the last time it ran, in
+# seconds. The parallel runner starts the longest jobs first, so that the
+# batch isn't left waiting on one long job that started last.
+TIMES_PATH = ROOT / ".cache" / "run_times.json"
+
+# Roughly how long the slow (day, part)s take on the puzzle input, in seconds,
+# for the parts that haven't been timed yet, e.g on a fresh checkout. Parts
+# that aren't listed take a few milliseconds.
+DEFAULT_SECONDS: Dict[Tuple[int, int], float] = {
+    (15, 2): 4.0,
+    (12, 2): 0.5,
+    (7, 2): 0.5,
+    (7, 1): 0.2,
+    (15, 1): 0.1,
+}
+
+
+def load_times(path: Path = TIMES_PATH) -> Dict[Tuple[int, int], float]:
+    """
+    The last recorded wall time of every (day, part). The parts that never
+    ran (or a missing or corrupt file) have no time.
+    """
+    try:
+        with open(path) as f:
+            times = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return {tuple(map(int, key.split("."))): wall for key, wall in times.items()}
+
+
+def record_times(timings: List[Timing], path: Path = TIMES_PATH):
+    """
+    Updates the recorded times of the parts that were just run. The file is
+    replaced at once, so that concurrent runs never read half of it.
+    """
+    times = {f"{day}.{part}": wall for (day, part), wall in load_times(path).items()}
+    for t in timings:
+        if t.stage != "parse":
+            times[f"{t.day}.{t.stage.split()[-1]}"] = round(t.wall, 6)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    with open(tmp, "w") as f:
+        json.dump(times, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def measure(
+    fn: Callable, *args, trace_memory: bool = True
+) -> Tuple[Any, float, float, int]:
+    """
+    Calls fn(*args) and returns its result together with the wall time, the
+    CPU time (both in seconds) and the peak memory allocated during the call
+    (in bytes, 0 when trace_memory is False). tracemalloc slows down
+    allocation heavy code, so it can be turned off to get cleaner timings.
+    """
+    if trace_memory:
+        tracemalloc.start()
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = fn(*args)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return result, wall, cpu, peak
+
+
+def solve(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Some parts (day 13) print their answer instead of returning it. We capture
+    whatever is printed and use that as the answer in that case.
+    """
+    out = io.StringIO()
+    with redirect_stdout(out):
+        result = fn(*args, **kwargs)
+
+    return out.getvalue().rstrip("\n") if result is None else result
+
+
+def parse_day(
+    day: int, path: Path, trace_memory: bool, use_cache: bool
+) -> Tuple[Any, Timing]:
+    """
+    With use_cache, the parsed input is loaded from (or stored in) the
+    on-disk cache, see aoc.cache.
+    """
+    module = load_day(day)
+    spec = DAYS[day]
+    if use_cache:
+        from aoc.cache import parse_cached
+
+        parsed, wall, cpu, peak = measure(
+            parse_cached, day, module, path, spec.parse, trace_memory=trace_memory
+        )
+    else:
+        parsed, wall, cpu, peak = measure(
+            spec.parse, module, path, trace_memory=trace_memory
+        )
+
+    return parsed, Timing(day, "parse", wall, cpu, peak, None)
+
+
+def solve_part(day: int, part: int, parsed: Any, trace_memory: bool) -> Timing:
+    module = load_day(day)
+    spec = DAYS[day]
+    answer, wall, cpu, peak = measure(
+        lambda: solve(spec.parts[part - 1], module, parsed, **spec.params[part - 1]),
+        trace_memory=trace_memory,
+    )
+    return Timing(day, f"part {part}", wall, cpu, peak, answer)
+
+
+def run_parts(
+    day: int,
+    parts: List[int],
+    path: Path,
+    trace_memory: bool = True,
+    use_cache: bool = False,
+    use_memo: bool = False,
+) -> List[Timing]:
+    """
+    Parses the input and solves the given parts of a day. With use_memo, the
+    answers are looked up in the result store first (see aoc.memo), and the
+    input is only parsed when at least one of the parts isn't stored yet. A
+    part that was found in the store is timed by how long the lookup took.
+    """
+    timings = {}
+    if use_memo:
+        from aoc.memo import ResultStore
+
+        store = ResultStore()
+        keys = {p: store.key(day, p, DAYS[day].params[p - 1], path) for p in parts}
+        for part in parts:
+            (found, answer), wall, cpu, peak = measure(
+                store.get, keys[part], trace_memory=trace_memory
+            )
+            if found:
+                timings[part] = Timing(day, f"part {part}", wall, cpu, peak, answer)
+
+    missing = [part for part in parts if part not in timings]
+    if missing:
+        parsed, parse_timing = parse_day(day, path, trace_memory, use_cache)
+    else:
+        parse_timing = Timing(day, "parse", 0.0, 0.0, 0, None)
+
+    for part in missing:
+        timings[part] = solve_part(day, part, parsed, trace_memory)
+        if use_memo:
+            store.put(keys[part], timings[part].answer)
+
+    return [parse_timing] + [timings[part] for part in parts]
+
+
+def run_day(
+    day: int,
+    path: Optional[Path] = None,
+    trace_memory: bool = True,
+    use_cache: bool = False,
+    use_memo: bool = False,
+) -> List[Timing]:
+    """
+    Runs a day on its puzzle input, or on the input file at `path`.
+    """
+    parts = list(range(1, len(DAYS[day].parts) + 1))
+    return run_parts(
+        day, parts, path or input_path(day), trace_memory, use_cache, use_memo
+    )
+
+
+def run_part(
+    day: int, part: int, trace_memory: bool, use_cache: bool, use_memo: bool
+) -> Tuple[Timing, Timing]:
+    """
+    The unit of work of a parallel run: parses the day's puzzle input and
+    solves one of its parts. Every job parses the input itself, as the jobs
+    run in separate processes.
+    """
+    parse_timing, part_timing = run_parts(
+        day, [part], input_path(day), trace_memory, use_cache, use_memo
+    )
+    return parse_timing, part_timing
+
+
+def run_parallel(
+    days: List[int], jobs: int, trace_memory: bool, use_cache: bool, use_memo: bool
+) -> List[Timing]:
+    """
+    Runs every (day, part) as a separate job on a pool of `jobs` processes.
+    The jobs are submitted longest first, as recorded by the previous runs
+    (see record_times), and the pool hands them out in that order as
+    processes become free. The parts that never ran are ordered by
+    DEFAULT_SECONDS instead. The timings are returned in the same order as a
+    serial run, with the parse timing of each day taken from its part 1 job.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    tasks = [(day, part) for day in days for part in range(1, len(DAYS[day].parts) + 1)]
+    expected = load_times()
+    tasks.sort(
+        key=lambda task: expected.get(task, DEFAULT_SECONDS.get(task, 0)),
+        reverse=True,
+    )
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            task: pool.submit(run_part, *task, trace_memory, use_cache, use_memo)
+            for task in tasks
+        }
+        results = {task: future.result() for task, future in futures.items()}
+
+    timings = []
+    for day, part in sorted(results):
+        parse_timing, part_timing = results[(day, part)]
+        if part == 1:
+            timings.append(parse_timing)
+        timings.append(part_timing)
+
+    return timings
+
+
+def run(
+    days: List[int],
+    trace_memory: bool = True,
+    use_cache: bool = False,
+    jobs: int = 1,
+    use_memo: bool = False,
+) -> List[Timing]:
+    """
+    Runs the days one after the other, or in parallel when jobs > 1. Use
+    jobs=0 for one process per CPU core. The times of the parts are recorded
+    for the next parallel run, except for the answers looked up in the
+    result store, whose times say nothing about the parts.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1:
+        timings = run_parallel(days, jobs, trace_memory, use_cache, use_memo)
+    else:
+        timings = []
+        for day in days:
+            timings += run_day(
+                day, trace_memory=trace_memory, use_cache=use_cache, use_memo=use_memo
+            )
+
+    if not use_memo:
+        record_times(timings)
+    return timings
+
+
+def to_json(timings: List[Timing]) -> str:
+    return json.dumps([t._asdict() for t in timings], indent=2, default=str)
+
+
+def to_table(timings: List[Timing]) -> str:
+    from prettytable import PrettyTable
+
+    table = PrettyTable()
+    table.field_names = [
+        "day", "stage", "wall (ms)", "cpu (ms)", "peak (KiB)", "answer"
+    ]
+    table.align = "r"
+    table.align["stage"] = "l"
+    table.align["answer"] = "l"
+    for t in timings:
+        answer = "" if t.answer is None else str(t.answer)
+        if "\n" in answer:
+            answer = "<multiline>"
+        table.add_row(
+            [
+                t.day,
+                t.stage,
+                f"{t.wall * 1000:.2f}",
+                f"{t.cpu * 1000:.2f}",
+                f"{t.peak_memory / 1024:.1f}",
+                answer,
+            ]
+        )
+
+    return table.get_string()
@@ -1,9 +1,13 @@
-from typing import List
+import operator
+import sys
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Sequence, Union
 from pathlib import Path
 
 
-def read_input() -> List[int]:
-    path_to_input = Path(__file__).parent / "input.txt"
+def read_input(filename: str = "input.txt") -> List[int]:
+    path_to_input = Path(__file__).parent / filename
     with open(path_to_input) as f:
         content = f.readlines()
 
@@ -12,24 +16,96 @@ def read_input() -> List[int]:
     return content
 
 
-def part_1(content: List[str]) -> int:
-    incr = 0
-    for i in range(1, len(content)):
-        if content[i] > content[i - 1]:
-            incr += 1
-    return incr
+def read_depths(filename: str = "input.txt") -> "numpy.ndarray":
+    """
+    Loads the depths straight into an int array, without going through a
+    Python int for every depth.
+    """
+    import numpy as np
 
+    path_to_input = Path(__file__).parent / filename
+    return np.fromfile(path_to_input, dtype=np.int64, sep=" ")
 
-def part_2(content: List[str]) -> int:
-    sums = []
-    for i in range(len(content) - 2):
-        curr_sum = content[i] + content[i + 1] + content[i + 2]
-        sums.append(curr_sum)
 
-    return part_1(sums)
+def parse_input(
+    filename: str = "input.txt", as_array: bool = False
+) -> Sequence[int]:
+    """
+    With as_array, the depths are an int array, and both parts count the
+    increases with vectorized comparisons instead of a Python loop.
+    numpy is only imported in that case.
+    """
+    if as_array:
+        return read_depths(filename)
+    return tuple(read_input(filename))
+
+
+def count_increases(depths: Sequence[int], window: int = 1) -> int:
+    """
+    The number of times the sum of `window` consecutive depths increases.
+    Two consecutive windows share all of their depths but the first one of
+    the first window and the last one of the second window, so the sum
+    increases exactly when depths[i + window] > depths[i]. That way, we never
+    have to compute the sums themselves.
+    """
+    if window < 1:
+        raise ValueError(f"a window holds at least one depth, got {window}")
+    if isinstance(depths, (list, tuple)):
+        return sum(map(operator.lt, depths, islice(depths, window, None)))
+    # an ndarray
+    return int((depths[window:] > depths[:-window]).sum())
+
+
+def iter_depths(readings: Iterable[Union[int, str]]) -> Iterator[int]:
+    """
+    The depths of any iterable of ints or of lines, e.g an open file or
+    sys.stdin. Blank lines are skipped.
+    """
+    for reading in readings:
+        if isinstance(reading, (str, bytes)):
+            reading = reading.strip()
+            if not reading:
+                continue
+        yield int(reading)
+
+
+def stream_increases(
+    readings: Iterable[Union[int, str]], windows: Sequence[int] = (1, 3)
+) -> Dict[int, int]:
+    """
+    Same as count_increases, for each of the window sizes at once, in a
+    single pass over the readings. We only keep the last max(windows) depths,
+    in a ring buffer, so this runs in O(k) memory on feeds of any length.
+    """
+    for window in windows:
+        if window < 1:
+            raise ValueError(f"a window holds at least one depth, got {window}")
+    last = deque(maxlen=max(windows))
+    increases = dict.fromkeys(windows, 0)
+    for depth in iter_depths(readings):
+        for window in windows:
+            if len(last) >= window and depth > last[-window]:
+                increases[window] += 1
+        last.append(depth)
+
+    return increases
+
+
+def part_1(content: Sequence[int]) -> int:
+    return count_increases(content, 1)
+
+
+def part_2(content: Sequence[int]) -> int:
+    return count_increases(content, 3)
 
 
 if __name__ == "__main__":
-    content = read_input()
+    if "--stream" in sys.argv:  # e.g: python day1.py --stream < input.txt
+        increases = stream_increases(sys.stdin)
+        print(f"part 1: {increases[1]}")
+        print(f"part 2: {increases[3]}")
+        sys.exit()
+
+    content = parse_input(as_array="--numpy" in sys.argv)
     print(f"part 1: {part_1(content)}")
     print(f"part 2: {part_2(content)}")
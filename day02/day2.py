@@ -1,8 +1,46 @@
-from typing import List
+import re
+import sys
+from collections import namedtuple
+from functools import lru_cache, reduce
+from typing import List, Optional, Tuple
 from pathlib import Path
 
+# The columnar form of a course: the direction code of every move as an
+# uint8 array, and the distances as an int array.
+Course = namedtuple("Course", ["directions", "dists"])
+
+# What a run of moves does, when it starts with an aim of 0: how much it
+# changes the aim and the horizontal position, how much it changes the
+# vertical position, and the sum of its forward distances. That last one
+# tells how the vertical change depends on the aim that the run starts with.
+Summary = namedtuple(
+    "Summary", ["delta_aim", "delta_h", "delta_v_base", "sum_forward"]
+)
+
+FORWARD, DOWN, UP, BACK = 0, 1, 2, 3
+DIRECTIONS = ("forward", "down", "up")
+
+# Spaces and tabs at the end of a line, which split(" ") used to ignore.
+_TRAILING_SPACE = re.compile(rb"[ \t]+(?=\n)")
+
+
+@lru_cache(maxsize=None)
+def _codes() -> "numpy.ndarray":
+    """
+    The direction code of the first letter of a line. Any other direction
+    moves back, like the else branches of the parts used to.
+    """
+    import numpy as np
+
+    codes = np.full(256, BACK, dtype=np.uint8)
+    for code, direction in enumerate(DIRECTIONS):
+        codes[ord(direction[0])] = code
+    return codes
+
 
 class Movement:
+    __slots__ = ("direction", "dist")
+
     def __init__(self, direction: str, dist: int):
         self.direction = direction
         self.dist = dist
@@ -11,8 +49,8 @@ class Movement:
         return f"{self.direction}: {self.dist}"
 
 
-def read_input() -> List[Movement]:
-    path_to_input = Path(__file__).parent / "input.txt"
+def read_input(filename: str = "input.txt") -> List[Movement]:
+    path_to_input = Path(__file__).parent / filename
     with open(path_to_input) as f:
         content = f.readlines()
 
@@ -22,41 +60,159 @@ def read_input() -> List[Movement]:
     return content
 
 
-def part_1(content: List[Movement]) -> int:
-    horizontal = 0
-    vertical = 0
-    for move in content:
-        if move.direction == "down":
-            vertical += move.dist
-        elif move.direction == "up":
-            vertical -= move.dist
-        elif move.direction == "forward":
-            horizontal += move.dist
-        else:
-            horizontal -= move.dist
+def parse_course(data: bytes) -> Course:
+    """
+    Parses all the lines at once, on the bytes of the input. The direction of
+    a line is told by its first letter, and the distance is the number after
+    the space, which we build up digit by digit: in round k, every distance
+    that has more than k digits is multiplied by 10 and gets its k-th digit
+    added.
+    Windows line endings and trailing spaces are dropped first, and a line
+    that isn't a direction, one space and a number raises a ValueError.
+    """
+    import numpy as np
 
-    return vertical * horizontal
+    if not data.strip():
+        return Course(np.zeros(0, dtype=np.uint8), np.zeros(0, dtype=np.int64))
 
+    data = _TRAILING_SPACE.sub(b"", data.replace(b"\r", b"").rstrip() + b"\n")
+    buf = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(buf == ord("\n"))
+    starts = np.r_[0, ends[:-1] + 1]
+    directions = _codes()[buf[starts]]
 
-def part_2(content: List[Movement]) -> int:
-    horizontal = 0
-    vertical = 0
-    aim = 0
-    for move in content:
-        if move.direction == "down":
-            aim += move.dist
-        elif move.direction == "up":
-            aim -= move.dist
-        elif move.direction == "forward":
-            horizontal += move.dist
-            vertical += move.dist * aim
-        else:
-            horizontal -= move.dist
+    # every line must hold exactly one space: the line of each space (the
+    # first end of line after it) must be 0, 1, 2, ...
+    spaces = np.flatnonzero(buf == ord(" "))
+    lines = np.searchsorted(ends, spaces)
+    if len(spaces) != len(ends) or (lines != np.arange(len(ends))).any():
+        raise ValueError("every move must be a direction, a space and a distance")
 
+    digits = spaces + 1
+
+    widths = ends - digits
+    dists = np.zeros(len(ends), dtype=np.int64)
+    for k in range(int(widths.max(initial=0))):
+        more = widths > k
+        digit = buf[np.where(more, digits + k, digits)].astype(np.int64) - ord("0")
+        if ((digit < 0) | (digit > 9))[more].any():
+            raise ValueError("the distance of a move must be a number")
+        dists = np.where(more, dists * 10 + digit, dists)
+
+    return Course(directions, dists)
+
+
+def parse_input(filename: str = "input.txt") -> Course:
+    path_to_input = Path(__file__).parent / filename
+    return parse_course(path_to_input.read_bytes())
+
+
+def _total(values: "numpy.ndarray") -> int:
+    return int(values.sum())
+
+
+def part_1(course: Course) -> int:
+    directions, dists = course
+    horizontal = _total(dists[directions == FORWARD])
+    horizontal -= _total(dists[directions == BACK])
+    vertical = _total(dists[directions == DOWN]) - _total(dists[directions == UP])
     return vertical * horizontal
 
 
+def summarize(course: Course) -> Summary:
+    """
+    The aim after each move is the prefix sum of the aim deltas (+dist for
+    down, -dist for up), and every forward move adds dist * aim to the
+    vertical position. The products can get larger than an int64 on very
+    long courses, in which case we fall back to Python ints.
+    """
+    import numpy as np
+
+    directions, dists = course
+    deltas = np.where(directions == DOWN, dists, 0)
+    deltas -= np.where(directions == UP, dists, 0)
+    aim = np.cumsum(deltas)
+    forward = directions == FORWARD
+    sum_forward = _total(dists[forward])
+
+    bound = int(np.abs(aim).max(initial=0)) * sum_forward
+    if bound < 2 ** 63:
+        vertical = _total(dists[forward] * aim[forward])
+    else:
+        products = dists[forward].astype(object) * aim[forward].astype(object)
+        vertical = _total(products)
+
+    return Summary(
+        int(aim[-1]) if len(aim) else 0,
+        sum_forward - _total(dists[directions == BACK]),
+        vertical,
+        sum_forward,
+    )
+
+
+def combine(first: Summary, second: Summary) -> Summary:
+    """
+    The summary of the moves of first followed by the moves of second. The
+    moves of second start with the aim that first ends with, which adds
+    first.delta_aim * dist to the vertical position of every forward move of
+    second.
+    """
+    return Summary(
+        first.delta_aim + second.delta_aim,
+        first.delta_h + second.delta_h,
+        first.delta_v_base
+        + second.delta_v_base
+        + first.delta_aim * second.sum_forward,
+        first.sum_forward + second.sum_forward,
+    )
+
+
+def part_2(course: Course) -> int:
+    summary = summarize(course)
+    return summary.delta_v_base * summary.delta_h
+
+
+def summarize_chunk(path: Path, start: int, end: int) -> Summary:
+    from aoc.chunks import read_chunk
+
+    return summarize(parse_course(read_chunk(path, start, end)))
+
+
+def solve_parallel(
+    filename: str = "input.txt",
+    jobs: Optional[int] = None,
+    chunk_size: int = 64 * 2 ** 20,
+) -> Tuple[int, int]:
+    """
+    Solves both parts of a course file that is too large to parse at once.
+    Every chunk of the file is summarized by a process of the pool, and the
+    summaries are combined in the order of the chunks (combine is
+    associative, but not commutative). Part 1's depth is the aim of part 2.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from aoc.chunks import chunk_bounds
+
+    path = Path(__file__).parent / filename
+    bounds = chunk_bounds(path, chunk_size)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # a list of paths rather than repeat(path): with no bounds (an empty
+        # file), map would otherwise run forever on repeat alone
+        paths = [path] * len(bounds)
+        summaries = pool.map(summarize_chunk, paths, *zip(*bounds))
+        total = reduce(combine, summaries, Summary(0, 0, 0, 0))
+
+    return total.delta_aim * total.delta_h, total.delta_v_base * total.delta_h
+
+
 if __name__ == "__main__":
-    content = read_input()
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    if "--parallel" in sys.argv:  # e.g: python day2.py --parallel huge.txt
+        part_1_answer, part_2_answer = solve_parallel(sys.argv[-1])
+        print(f"part 1: {part_1_answer}")
+        print(f"part 2: {part_2_answer}")
+        sys.exit()
+
+    content = parse_input()
     print(f"part 1: {part_1(content)}")
     print(f"part 2: {part_2(content)}")
@@ -1,6 +1,22 @@
-from typing import List
+import re
+import sys
+from functools import reduce
+from typing import TYPE_CHECKING, BinaryIO, List, Optional, Sequence, Tuple
 from pathlib import Path
-from collections import defaultdict
+from collections import namedtuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# The diagnostic report, with every reading packed into one machine word,
+# and the number of bits of the readings.
+Report = namedtuple("Report", ["readings", "width"])
+
+# The number of ones in each column of (a part of) a report, and its number
+# of rows.
+ColumnCounts = namedtuple("ColumnCounts", ["ones", "rows"])
+
+_TRAILING_SPACE = re.compile(rb"[ \t]+(?=\n)")
 
 
 def read_input(input: str) -> List[str]:
@@ -13,120 +29,208 @@ def read_input(input: str) -> List[str]:
     return content
 
 
-# TODO: probably a very inefficient method to transpose a matrix. Fix later.
-def transpose(matrix: List[List[int]]) -> List[List[int]]:
-    rows = len(matrix)
-    cols = len(matrix[0])
-    transposed = []
+def parse_report(data: bytes) -> Report:
+    """
+    All the readings have the same width, so the bytes of the input form a
+    (rows, width + 1) matrix of digits and newlines. Each row of digits is
+    packed into one integer by a dot product with the powers of 2.
+    Windows line endings and trailing spaces are dropped first, and readings
+    of different widths, or that aren't made of 0s and 1s, raise a
+    ValueError.
+    """
+    import numpy as np
 
-    for j in range(cols):
-        curr_col = []
-        for i in range(rows):
-            curr_col.append(matrix[i][j])
+    data = _TRAILING_SPACE.sub(b"", data.replace(b"\r", b"").strip() + b"\n")
+    width = data.index(b"\n")
+    if width > 64:
+        raise ValueError(f"readings of {width} bits don't fit in a 64 bit word")
 
-        transposed.append(curr_col)
+    buf = np.frombuffer(data, dtype=np.uint8)
+    if len(buf) % (width + 1):
+        raise ValueError("all the readings must have the same width")
+    rows = buf.reshape(-1, width + 1)
+    if (rows[:, width] != ord("\n")).any():
+        raise ValueError("all the readings must have the same width")
+    bits = rows[:, :width] - np.uint8(ord("0"))
+    if (bits > 1).any():
+        raise ValueError("a reading must only be made of 0s and 1s")
 
-    return transposed
+    powers = np.uint64(1) << np.arange(width - 1, -1, -1, dtype=np.uint64)
+    readings = bits.astype(np.uint64) @ powers
+    return Report(readings, width)
 
 
-def count_ones(row: List[str]) -> int:
-    count = 0
-    for element in row:
-        if element == "1":
-            count += 1
-    return count
+def parse_input(filename: str = "input.txt") -> Report:
+    path_to_input = Path(__file__).parent / filename
+    return parse_report(path_to_input.read_bytes())
 
 
-def part_1(content: List[str]) -> int:
+def count_ones(readings: "np.ndarray", width: int) -> List[int]:
     """
-    1. Tranpose the input. 
-    2. Build up the binary gamma rate number by following the given rule.
-    3. Find the epsilon rate by XOR'ing with only ones. 
-    4. Multiply their decimal representation. 
+    The number of ones in each column, from the most significant bit to the
+    least significant one.
     """
-    content_T = transpose(content)
-    cols = len(content_T[0])
-    gamma_rate_bin = ""
-    for row in content_T:
-        num_ones = count_ones(row)
-        if num_ones > cols - num_ones:  # if there is a majority of ones
-            gamma_rate_bin += "1"
-        else:
-            gamma_rate_bin += "0"
+    import numpy as np
 
-    gamma_rate_dec = int(gamma_rate_bin, 2)
-    ones = "1" * len(gamma_rate_bin)
-    epsilon_rate_dec = int(gamma_rate_bin, 2) ^ int(ones, 2)
+    return [
+        int(np.count_nonzero(readings & (np.uint64(1) << np.uint64(shift))))
+        for shift in range(width - 1, -1, -1)
+    ]
 
+
+def gamma_epsilon(ones: Sequence[int], rows: int) -> Tuple[int, int]:
+    """
+    Build up the binary gamma rate number by following the given rule, and
+    find the epsilon rate by XOR'ing with only ones.
+    """
+    gamma_rate_dec = 0
+    for num_ones in ones:
+        # if there is a majority of ones
+        gamma_rate_dec = gamma_rate_dec << 1 | (num_ones > rows - num_ones)
+
+    epsilon_rate_dec = gamma_rate_dec ^ ((1 << len(ones)) - 1)
+    return gamma_rate_dec, epsilon_rate_dec
+
+
+def part_1(report: Report) -> int:
+    """
+    1. Count the ones in each column of the packed readings.
+    2. Find the gamma and epsilon rates.
+    3. Multiply their decimal representation.
+    """
+    readings, width = report
+    gamma_rate_dec, epsilon_rate_dec = gamma_epsilon(
+        count_ones(readings, width), len(readings)
+    )
     return gamma_rate_dec * epsilon_rate_dec
 
 
-def most_common_bit_incl(matrix: List[List[str]], pos: int) -> str:
-    rows = len(matrix)
-    num_ones = 0
-    for i in range(rows):
-        if matrix[i][pos] == "1":
-            num_ones += 1
+def count_columns(data: bytes) -> ColumnCounts:
+    readings, width = parse_report(data)
+    return ColumnCounts(tuple(count_ones(readings, width)), len(readings))
+
 
-    return "1" if num_ones >= rows - num_ones else "0"
+def merge_counts(first: ColumnCounts, second: ColumnCounts) -> ColumnCounts:
+    if not first.rows:
+        return second
+    ones = tuple(a + b for a, b in zip(first.ones, second.ones))
+    return ColumnCounts(ones, first.rows + second.rows)
 
 
-def get_nums_with_bit_in_pos(
-    matrix: List[List[str]], pos: int, bit: str
-) -> List[List[str]]:
-    rows = len(matrix)
-    correct_nums = []
-    for i in range(rows):
-        if matrix[i][pos] == bit:
-            correct_nums.append(matrix[i])
+def stream_part_1(f: BinaryIO, chunk_size: int = 2 ** 24) -> int:
+    """
+    Same as part_1, on a report that is read from f chunk by chunk. Gamma and
+    epsilon only depend on the number of ones in each column and the number
+    of rows, so we only keep those counts, and never more than one chunk of
+    the report.
+    """
+    from aoc.chunks import iter_chunks
 
-    return correct_nums
+    chunks = map(count_columns, iter_chunks(f, chunk_size))
+    counts = reduce(merge_counts, chunks, ColumnCounts((), 0))
+    gamma_rate_dec, epsilon_rate_dec = gamma_epsilon(counts.ones, counts.rows)
+    return gamma_rate_dec * epsilon_rate_dec
 
 
-def get_oxygen_rating(matrix: List[List[str]], pos: int) -> List[List[str]]:
-    if len(matrix) == 1:
-        return matrix
+def count_chunk(path: Path, start: int, end: int) -> ColumnCounts:
+    from aoc.chunks import read_chunk
 
-    mc_bit = most_common_bit_incl(matrix, pos)
-    nums = get_nums_with_bit_in_pos(matrix, pos, mc_bit)
-    return get_oxygen_rating(nums, pos + 1)
+    return count_columns(read_chunk(path, start, end))
 
 
-def get_co2_rating(matrix: List[List[str]], pos: int) -> List[List[str]]:
+def parallel_part_1(
+    filename: str = "input.txt",
+    jobs: Optional[int] = None,
+    chunk_size: int = 2 ** 24,
+) -> int:
     """
-    The least common bit is just the opposite of the most common bit. 
+    Same as stream_part_1, with the chunks counted on a pool of processes.
     """
-    if len(matrix) == 1:
-        return matrix
-
-    mc_bit = most_common_bit_incl(matrix, pos)
-    lc_bit = "0" if mc_bit == "1" else "1"
-    nums = get_nums_with_bit_in_pos(matrix, pos, lc_bit)
+    from concurrent.futures import ProcessPoolExecutor
 
-    return get_co2_rating(nums, pos + 1)
+    from aoc.chunks import chunk_bounds
 
+    path = Path(__file__).parent / filename
+    bounds = chunk_bounds(path, chunk_size)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # one path per chunk: with no chunks (an empty file), repeat(path)
+        # would keep map going forever
+        paths = [path] * len(bounds)
+        chunks = pool.map(count_chunk, paths, *zip(*bounds))
+        counts = reduce(merge_counts, chunks, ColumnCounts((), 0))
 
-def to_dec(bit: str) -> int:
-    return int("".join(bit), 2)
+    gamma_rate_dec, epsilon_rate_dec = gamma_epsilon(counts.ones, counts.rows)
+    return gamma_rate_dec * epsilon_rate_dec
 
 
-def part_2(content: List[List[str]]) -> int:
+class RatingIndex:
     """
-    Follow the rule of finding the most common/least common bit in each column.
-    The least common is simply the opposite of the most common bit, so we can
-    simply reuse the code there.  
-    get_oxygen_rating() and get_co2_rating both returns a List[List[str]]. 
-    Since we assume that all the binary numbers in the input is unique, we know
-    that these functions return a List[List[str]] with one element in the end. 
+    The readings, sorted once. The readings that share their first pos bits
+    form a contiguous range of the sorted readings, and within that range,
+    the ones with a 0 at pos come before the ones with a 1. So every step of
+    the bit criteria only narrows the range down to one of its two halves,
+    and the split between them is found by bisection: a rating costs
+    O(width * log(n)) instead of copying the surviving readings at every
+    step.
     """
 
-    oxygen_rating = get_oxygen_rating(content, 0)[0]
-    co2_rating = get_co2_rating(content, 0)[0]
+    def __init__(self, readings: "np.ndarray", width: int):
+        import numpy as np
+
+        self.readings = np.sort(readings)
+        self.width = width
+
+    def split(self, lo: int, hi: int, pos: int) -> int:
+        """
+        The index of the first reading in [lo, hi) that has a 1 at pos.
+        """
+        import numpy as np
+
+        shift = self.width - 1 - pos
+        prefix = int(self.readings[lo]) >> (shift + 1) << (shift + 1)
+        first_one = np.uint64(prefix | 1 << shift)
+        return lo + int(np.searchsorted(self.readings[lo:hi], first_one))
 
-    return to_dec(oxygen_rating) * to_dec(co2_rating)
+    def rating(self, most_common: bool) -> int:
+        """
+        Follow the rule of finding the most common (or least common) bit at
+        each position, with ties going to 1 (or 0). When all the remaining
+        readings have the same bit, they all stay.
+        """
+        lo, hi = 0, len(self.readings)
+        for pos in range(self.width):
+            if hi - lo <= 1:
+                break
+
+            mid = self.split(lo, hi, pos)
+            ones, zeros = hi - mid, mid - lo
+            if not ones or not zeros:
+                continue
+
+            keep_ones = ones >= zeros if most_common else ones < zeros
+            lo, hi = (mid, hi) if keep_ones else (lo, mid)
+
+        return int(self.readings[lo])
+
+
+def part_2(report: Report) -> int:
+    """
+    The oxygen generator rating keeps the most common bits, the CO2 scrubber
+    rating the least common ones. Both are looked up in the same index.
+    """
+    index = RatingIndex(*report)
+    return index.rating(most_common=True) * index.rating(most_common=False)
 
 
 if __name__ == "__main__":
-    content = read_input("input.txt")
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    if "--stream" in sys.argv:  # e.g: python day3.py --stream < input.txt
+        print(f"part 1: {stream_part_1(sys.stdin.buffer)}")
+        sys.exit()
+    if "--parallel" in sys.argv:  # e.g: python day3.py --parallel huge.txt
+        print(f"part 1: {parallel_part_1(sys.argv[-1])}")
+        sys.exit()
+
+    content = parse_input("input.txt")
     print(f"part 1: {part_1(content)}")
     print(f"part 2: {part_2(content)}")
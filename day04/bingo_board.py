@@ -1,56 +1,79 @@
+from array import array
 from collections import defaultdict
-from typing import List, Tuple, Union, Dict
+from typing import Dict, List
 
 
 class BingoBoard:
     """
-    This class represents each individual bingo board. Internally, it has its
-    own representation of the original, along with a dictionary that maps from
-    a bingo number to the (i, j) coordinate it is on the board.
-    We also store a boolean 2D-list to represents the positions that have been
-    marked.
+    This class represents each individual bingo board. Instead of keeping
+    track of every marked position, it counts the marked positions in each
+    row and column. The board wins as soon as one of these counters reaches
+    the size of the board, which we can check in O(1) on every mark. The sum
+    of the unmarked numbers is kept up to date as well.
     """
 
+    __slots__ = ("board", "size", "row_hits", "col_hits", "unmarked_sum", "won")
+
     def __init__(self, board: List[List[int]]):
         self.board = board
-        self.num_to_coordinate = self._make_num_to_coordinate_map(board)
-        self.boolean_board = [
-            [False for _ in range(len(board[0]))] for _ in range(len(board))
-        ]
+        self.size = len(board)
+        self.row_hits = [0] * self.size
+        self.col_hits = [0] * self.size
+        self.unmarked_sum = sum(map(sum, board))
+        self.won = False
 
-    def mark(self, num: int) -> Union[Tuple[int, int], None]:
+    def mark(self, x: int, y: int) -> bool:
         """
-        Returns the coordinates of the number in the board if the number
-        is in this board.
+        Marks the position (x, y), and returns True if that made the board
+        win, which happens only once.
         """
-        if num in self.num_to_coordinate:
-            x, y = self.num_to_coordinate[num]
-            self.boolean_board[x][y] = True
-            return x, y
+        self.row_hits[x] += 1
+        self.col_hits[y] += 1
+        self.unmarked_sum -= self.board[x][y]
+        if self.won:
+            return False
 
-        return None
+        self.won = self.row_hits[x] == self.size or self.col_hits[y] == self.size
+        return self.won
 
-    def has_won(self, x: int, y: int) -> bool:
-        curr_row = self.boolean_board[x]
-        curr_col = [row[y] for row in self.boolean_board]
-        return all(curr_row) or all(curr_col)
+    def has_won(self) -> bool:
+        return self.won
 
     def sum_of_unmarked(self) -> int:
-        unmarked_sum = 0
-        for i in range(len(self.boolean_board)):
-            for j in range(len(self.boolean_board[0])):
-                if not self.boolean_board[i][j]:
-                    unmarked_sum += int(self.board[i][j])
-
-        return unmarked_sum
-
-    def _make_num_to_coordinate_map(
-        self, board: List[List[int]]
-    ) -> Dict[int, Tuple[int, int]]:
-        num_to_c_map = defaultdict(tuple)
-        for i in range(len(board)):
-            for j in range(len(board[0])):
-                num = board[i][j]
-                num_to_c_map[num] = (i, j)
-
-        return num_to_c_map
+        return self.unmarked_sum
+
+
+class BingoHall:
+    """
+    All the boards of a game, together with an inverted index that maps
+    every number to the positions it is on: (board id, row, col). A draw
+    only visits the boards that hold the number, so its cost doesn't depend
+    on the number of boards.
+    The boards all have the same size, so a position is packed into a single
+    int, (board id * size + row) * size + col, and the positions of a number
+    are stored in an array rather than a list of tuples.
+    """
+
+    def __init__(self, boards: List[List[List[int]]]):
+        self.boards = [BingoBoard(board) for board in boards]
+        self.size = len(boards[0]) if boards else 0
+        self.index: Dict[int, array] = defaultdict(lambda: array("q"))
+        for b, board in enumerate(boards):
+            for i, row in enumerate(board):
+                for j, num in enumerate(row):
+                    self.index[num].append((b * self.size + i) * self.size + j)
+
+    def draw(self, num: int) -> List[int]:
+        """
+        Marks the number on every board that holds it, and returns the ids of
+        the boards that won with it. A number is only marked the first time
+        it is drawn.
+        """
+        winners = []
+        for position in self.index.pop(num, ()):
+            cell, j = divmod(position, self.size)
+            b, i = divmod(cell, self.size)
+            if self.boards[b].mark(i, j):
+                winners.append(b)
+
+        return winners
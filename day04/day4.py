@@ -1,6 +1,13 @@
-from typing import List, Union, Tuple
+import sys
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Union, Tuple
 from pathlib import Path
-from bingo_board import BingoBoard
+
+from bingo_board import BingoHall
+
+if TYPE_CHECKING:
+    import numpy as np
+
+Board = List[List[int]]
 
 
 def read_input(filename: str) -> Tuple[List[int], List[str]]:
@@ -14,61 +21,112 @@ def read_input(filename: str) -> Tuple[List[int], List[str]]:
     return bingo_nums, content[2:]
 
 
-def parse_board(boards: List[str]) -> List[List[int]]:
+def parse_input(
+    filename: str = "input.txt",
+) -> Tuple["np.ndarray", "np.ndarray"]:
     """
-    Because of the way we parse the input, we know that each board is separated
-    by an empty string. So when the curr row is empty, the next non-empty row
-    will be a new board.
+    The drawn numbers as an int array, and the boards as one
+    (boards, size, size) int array. Both are read-only, as they are shared by
+    the parts.
     """
-    all_boards = []
-    curr_board = []
-    for curr_row in boards:
-        if curr_row:
-            row = curr_row.split(" ")
-            row = list(filter(lambda x: len(x) > 0, row))
-            row = [int(x) for x in row]
-            curr_board.append(row)
-        else:
-            if curr_board:
-                all_boards.append(curr_board)
-                curr_board = []
-    all_boards.append(curr_board)  # add the last board
-
-    return all_boards
-
-
-def part_1(bingo_nums: List[int], bingo_boards: List[BingoBoard]) -> Union[int, None]:
-    for num in bingo_nums:
-        for board in bingo_boards:
-            coord = board.mark(num)
-            if coord and board.has_won(coord[0], coord[1]):
-                return board.sum_of_unmarked() * num
+    import numpy as np
 
-    return None
+    bingo_nums, rows = read_input(filename)
+    rows = [row for row in rows if row.strip()]
+    size = len(rows[0].split())
+    boards = np.array(" ".join(rows).split(), dtype=np.int64).reshape(-1, size, size)
+    bingo_nums = np.array(bingo_nums, dtype=np.int64)
+    bingo_nums.setflags(write=False)
+    boards.setflags(write=False)
+    return bingo_nums, boards
 
 
-def part_2(bingo_nums: List[int], bingo_boards: List[BingoBoard]) -> Union[int, None]:
+def winning_turns(
+    bingo_nums: "np.ndarray", boards: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray"]:
     """
-    We find the last winner by adding all the winners to a set and check if
-    the size of this set reaches the number of boards that are available.
+    Returns the turns at which the cells of all the boards are marked, and
+    the turn at which each board wins. A number that is never drawn gets
+    the turn len(bingo_nums), so a board that never wins wins "at" that turn.
+
+    We map every number to the turn that it is drawn at first. A row (or a
+    column) is complete at the latest turn of its cells, and a board wins
+    at the earliest turn that one of its rows or columns is complete.
     """
-    winners = set()
-    for num in bingo_nums:
-        for board in bingo_boards:
-            coord = board.mark(num)
-            if coord and board.has_won(coord[0], coord[1]):
-                winners.add(board)
-                # last winning board
-                if len(winners) == len(bingo_boards):
-                    return board.sum_of_unmarked() * num
+    import numpy as np
+
+    never = len(bingo_nums)
+    turn_of = np.full(max(bingo_nums.max(), boards.max()) + 1, never)
+    # a number can be drawn more than once, and its first draw counts
+    np.minimum.at(turn_of, bingo_nums, np.arange(never))
+
+    turns = turn_of[boards]
+    rows_done = turns.max(axis=2).min(axis=1)
+    cols_done = turns.max(axis=1).min(axis=1)
+    return turns, np.minimum(rows_done, cols_done)
+
+
+def score(
+    bingo_nums: "np.ndarray",
+    boards: "np.ndarray",
+    turns: "np.ndarray",
+    win: int,
+    b: int,
+) -> int:
+    """
+    The score of board b, which wins at turn win: the sum of its cells that
+    weren't marked by then, times the number that was drawn.
+    """
+    unmarked = boards[b][turns[b] > win]
+    return int(unmarked.sum()) * int(bingo_nums[win])
+
 
-    return None
+def part_1(bingo_nums: "np.ndarray", boards: "np.ndarray") -> Union[int, None]:
+    """
+    The first winner is the board with the earliest winning turn. On a tie,
+    argmin returns the first of the boards, as marking them one by one would.
+    """
+    turns, wins = winning_turns(bingo_nums, boards)
+    b = int(wins.argmin())
+    if wins[b] == len(bingo_nums):
+        return None
 
+    return score(bingo_nums, boards, turns, wins[b], b)
 
-if __name__ == "__main__":
-    bingo_nums, boards = read_input("input.txt")
-    all_boards = parse_board(boards)
-    all_boards = [BingoBoard(board) for board in all_boards]
 
-    print(f"part 1: {part_1(bingo_nums, all_boards)}")
-    print(f"part 2: {part_2(bingo_nums, all_boards)}")
+def part_2(bingo_nums: "np.ndarray", boards: "np.ndarray") -> Union[int, None]:
+    """
+    The last winner is the board with the latest winning turn, or the last of
+    them on a tie. If a board never wins, there is no last winner.
+    """
+    turns, wins = winning_turns(bingo_nums, boards)
+    b = len(wins) - 1 - int(wins[::-1].argmax())
+    if wins[b] == len(bingo_nums):
+        return None
+
+    return score(bingo_nums, boards, turns, wins[b], b)
+
+
+def play(bingo_nums: Iterable[int], boards: List[Board]) -> Iterator[Tuple[int, int]]:
+    """
+    Plays the game online, one draw at a time: yields the (id, score) of the
+    boards in the order that they win. Boards that win with the same draw
+    come in the order of their ids, like the argmin/argmax of the parts.
+    """
+    hall = BingoHall(boards)
+    for num in bingo_nums:
+        for b in hall.draw(num):
+            yield b, hall.boards[b].sum_of_unmarked() * num
+
+
+if __name__ == "__main__":
+    bingo_nums, boards = parse_input("input.txt")
+    if "--online" in sys.argv:
+        wins = list(play(bingo_nums.tolist(), boards.tolist()))
+        last = wins[-1][1] if len(wins) == len(boards) else None
+        print(f"part 1: {wins[0][1] if wins else None}")
+        print(f"part 2: {last}")
+        sys.exit()
+
+    print(f"part 1: {part_1(bingo_nums, boards)}")
+    print(f"part 2: {part_2(bingo_nums, boards)}")
@@ -1,7 +1,37 @@
-from typing import List, Tuple
+import math
+import os
+import sys
+from itertools import repeat
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from pathlib import Path
+
+import sweep
 from point import Point
 
+if TYPE_CHECKING:
+    import numpy as np
+
+    from aoc.grid import Grid
+
+# The largest grid (in cells) that the parts rasterize in one process. Above
+# it, they count the overlaps with a sweep line instead, see sweep.py, or on
+# a pool of processes when the plane is dense enough.
+MAX_GRID_CELLS = 2 ** 25
+
+# The memory (in bytes) that each process may use for its tile, when the
+# overlaps are counted on a pool of processes.
+MEMORY_PER_WORKER = 256 * 2 ** 20
+
+# The most tiles that each process of a pool rasterizes. Larger grids are
+# swept over, even on a pool.
+MAX_TILES_PER_WORKER = 64
+
+# Below this many cells of segments per cell of the grid, a plane is sparse:
+# rasterizing it would mostly go over empty cells, so we sweep over it.
+MIN_DENSITY = 2 ** -6
+
+Tile = Tuple[int, int, int, int]
+
 
 def get_list_of_points(content: List[str]) -> List[List[Point]]:
     """
@@ -20,107 +50,287 @@ def read_input(filename: str) -> List[str]:
     return content
 
 
-def get_grid_size(points: List[List[Point]]) -> Tuple[int, int]:
-    flattened = [p for point_pairs in points for p in point_pairs]
-    max_y = max(flattened, key=lambda p: p.y).y
-    max_x = max(flattened, key=lambda p: p.x).x
-    return max_x + 1, max_y + 1
+def parse_segments(data: bytes) -> "np.ndarray":
+    """
+    The segments as one (lines, 4) int array of x1, y1, x2, y2. Once the
+    arrows and the newlines are commas, the input is a single list of
+    numbers that numpy parses in one go.
+    """
+    import numpy as np
+
+    text = data.strip().replace(b" -> ", b",").replace(b"\n", b",").decode()
+    if not text:
+        return np.zeros((0, 4), dtype=np.int64)
+    return np.fromstring(text, dtype=np.int64, sep=",").reshape(-1, 4)
 
 
-def get_lines(
-    points: List[List[Point]],
-) -> Tuple[List[List[Point]], List[List[Point]]]:
+def parse_input(filename: str = "input.txt") -> "np.ndarray":
     """
-    We sort the source and destination pairs. First by the x-coordinate, then
-    by y. The function returns the point pairs into two different lists that
-    represents the non_diagonal and diagonal lines.
+    The segments are read-only, as they are shared by both parts.
     """
-    non_diagonals = []
-    diagonals = []
-    for source, dest in points:
-        point_pair = sorted([source, dest], key=lambda p1: (p1.x, p1.y))
-        if source.x == dest.x or source.y == dest.y:
-            non_diagonals.append(point_pair)
-        else:
-            diagonals.append(point_pair)
+    path_to_input = Path(__file__).parent / filename
+    with open(path_to_input, "rb") as f:
+        segments = parse_segments(f.read())
+
+    segments.setflags(write=False)
+    return segments
+
 
-    return non_diagonals, diagonals
+def get_grid_size(segments: "np.ndarray") -> Tuple[int, int]:
+    if not len(segments):
+        return 0, 0
+    max_x = max(segments[:, 0].max(), segments[:, 2].max())
+    max_y = max(segments[:, 1].max(), segments[:, 3].max())
+    return int(max_x) + 1, int(max_y) + 1
 
 
-def mark_non_diagonal_line(
-    grid: List[List[int]], source: Point, dest: Point
-) -> List[List[int]]:
+def get_lines(segments: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
     """
-    The 'smaller' point is source because we compare the x-coordinate before the y.
-    If source.x == dest.x, we know that source.y < dest.y.
+    Splits the segments into the non_diagonal and the diagonal lines.
     """
-    if source.x != dest.x:
-        for j in range(source.x, dest.x + 1):
-            grid[source.y][j] += 1
-    else:
-        for i in range(source.y, dest.y + 1):
-            grid[i][source.x] += 1
+    x1, y1, x2, y2 = segments.T
+    straight = (x1 == x2) | (y1 == y2)
+    return segments[straight], segments[~straight]
+
+
+def rasterize(
+    segments: "np.ndarray", shape: Tuple[int, int], batch_cells: int = 2 ** 22
+) -> "Grid":
+    """
+    Counts how many of the segments cover each cell of a (cols, rows) grid.
+
+    The cells of a horizontal, vertical or diagonal segment are evenly spaced
+    in the flat grid: they start at y1 * cols + x1, and each one is `step`
+    further than the previous one. So we can expand all the segments into the
+    flat indices of their cells at once: within a segment, each index is the
+    previous one plus the step, and the first cell of a segment jumps from
+    the last cell of the previous segment. The cumulative sum of those
+    differences gives every index, and bincount counts them.
+    The segments are expanded in batches of about batch_cells cells, which
+    bounds the memory of the indices.
+    """
+    import numpy as np
+
+    from aoc.grid import Grid
+
+    cols, rows = shape
+    grid = Grid.zeros(rows, cols, pad=0, dtype=np.int32)
+    if not len(segments):
+        return grid
+
+    counts = grid.data.reshape(-1)
+    x1, y1, x2, y2 = segments.T
+    lengths = np.maximum(np.abs(x2 - x1), np.abs(y2 - y1)) + 1
+    steps = np.sign(y2 - y1) * cols + np.sign(x2 - x1)
+    starts = y1 * cols + x1
+    lasts = starts + (lengths - 1) * steps
+    ends = np.cumsum(lengths)
+    offsets = ends - lengths
+
+    first = 0
+    while first < len(segments):
+        base = offsets[first]
+        last = int(np.searchsorted(ends, base + batch_cells, side="right"))
+        last = max(last, first + 1)
+
+        batch = slice(first, last)
+        diffs = np.repeat(steps[batch], lengths[batch])
+        diffs[offsets[batch] - base] = starts[batch] - np.concatenate(
+            ([0], lasts[first : last - 1])
+        )
+        cells = np.cumsum(diffs)
+        counts += np.bincount(cells, minlength=counts.size)
+        first = last
 
     return grid
 
 
-def mark_diagonal_line(
-    grid: List[List[int]], source: Point, dest: Point
-) -> List[List[int]]:
+def count_overlapping_lines(grid: "Grid") -> int:
+    import numpy as np
+
+    return int(np.count_nonzero(grid.cells > 1))
+
+
+def get_tiles(shape: Tuple[int, int], tile_cells: int) -> List[Tile]:
     """
-    We know that the Point with a smaller x value is source.
-    So we just need to check if source.y needs to be moved up or down.
+    Splits a (cols, rows) grid into tiles of at most tile_cells cells, as
+    square as the grid allows. A tile is (x0, y0, x1, y1), x1 and y1 excluded.
     """
-    curr_x = source.x
-    if source.y < dest.y:
-        for i in range(source.y, dest.y + 1):
-            grid[i][curr_x] += 1
-            curr_x += 1
-    else:
-        for i in range(source.y, dest.y - 1, -1):
-            grid[i][curr_x] += 1
-            curr_x += 1
+    cols, rows = shape
+    tile_cols = max(1, min(cols, math.isqrt(tile_cells)))
+    tile_rows = max(1, min(rows, tile_cells // tile_cols))
+    return [
+        (x0, y0, min(x0 + tile_cols, cols), min(y0 + tile_rows, rows))
+        for y0 in range(0, rows, tile_rows)
+        for x0 in range(0, cols, tile_cols)
+    ]
 
-    return grid
+
+def in_tile(segments: "np.ndarray", tile: Tile) -> "np.ndarray":
+    """
+    The segments whose bounding box meets the tile.
+    """
+    x0, y0, x1, y1 = tile
+    xs, ys = segments[:, 0::2], segments[:, 1::2]
+    return segments[
+        (xs.max(axis=1) >= x0)
+        & (xs.min(axis=1) < x1)
+        & (ys.max(axis=1) >= y0)
+        & (ys.min(axis=1) < y1)
+    ]
+
+
+def _clip_range(
+    start: "np.ndarray", step: "np.ndarray", lo: int, hi: int
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    The range [k_lo, k_hi] of k such that lo <= start + k * step < hi, for a
+    step of -1, 0 or 1. It is empty when a segment with a step of 0 is
+    outside of [lo, hi).
+    """
+    import numpy as np
+
+    inside = (start >= lo) & (start < hi)
+    big = np.iinfo(np.int64).max
+    k_lo = np.where(step > 0, lo - start, np.where(step < 0, start - hi + 1, 0))
+    k_hi = np.where(step > 0, hi - 1 - start, np.where(step < 0, start - lo, big))
+    k_hi = np.where((step == 0) & ~inside, -1, k_hi)
+    return k_lo, k_hi
 
 
-def count_overlapping_lines(grid: List[List[int]]) -> int:
-    count = 0
-    for i in range(len(grid)):
-        for j in range(len(grid[0])):
-            if grid[i][j] > 1:
-                count += 1
+def clip(segments: "np.ndarray", tile: Tile) -> "np.ndarray":
+    """
+    The parts of the segments that are inside the tile, in the coordinates
+    of the tile. The cell k of a segment is start + k * step, so each side of
+    the tile bounds k, and the part inside is the range of k that all sides
+    allow.
+    """
+    import numpy as np
 
-    return count
+    x0, y0, x1, y1 = tile
+    sx, sy, ex, ey = segments.T
+    dx, dy = np.sign(ex - sx), np.sign(ey - sy)
+    lengths = np.maximum(np.abs(ex - sx), np.abs(ey - sy)) + 1
 
+    kx_lo, kx_hi = _clip_range(sx, dx, x0, x1)
+    ky_lo, ky_hi = _clip_range(sy, dy, y0, y1)
+    k_lo = np.maximum(np.maximum(kx_lo, ky_lo), 0)
+    k_hi = np.minimum(np.minimum(kx_hi, ky_hi), lengths - 1)
+    keep = k_lo <= k_hi
 
-def part_1(points: List[List[Point]]) -> int:
-    max_x, max_y = get_grid_size(points)
-    non_diagonals, _ = get_lines(points)
-    grid = [[0 for _ in range(max_x)] for _ in range(max_y)]
+    k_lo, k_hi, dx, dy = k_lo[keep], k_hi[keep], dx[keep], dy[keep]
+    sx, sy = sx[keep] - x0, sy[keep] - y0
+    return np.stack(
+        [sx + k_lo * dx, sy + k_lo * dy, sx + k_hi * dx, sy + k_hi * dy], axis=1
+    )
 
-    for source, dest in non_diagonals:
-        grid = mark_non_diagonal_line(grid, source, dest)
 
+def count_tile(segments: "np.ndarray", tile: Tile, batch_cells: int) -> int:
+    x0, y0, x1, y1 = tile
+    grid = rasterize(clip(segments, tile), (x1 - x0, y1 - y0), batch_cells)
     return count_overlapping_lines(grid)
 
 
-def part_2(points: List[List[Point]]) -> int:
-    max_x, max_y = get_grid_size(points)
-    non_diagonals, diagonals = get_lines(points)
-    grid = [[0 for _ in range(max_x)] for _ in range(max_y)]
+def get_tile_cells(memory_per_worker: int) -> int:
+    return max(1, memory_per_worker * 3 // 4 // 12)
 
-    for source, dest in non_diagonals:
-        grid = mark_non_diagonal_line(grid, source, dest)
 
-    for source, dest in diagonals:
-        grid = mark_diagonal_line(grid, source, dest)
+def parallel_overlaps(
+    segments: "np.ndarray",
+    shape: Tuple[int, int],
+    jobs: Optional[int] = None,
+    memory_per_worker: int = MEMORY_PER_WORKER,
+) -> int:
+    """
+    Counts the overlaps tile by tile on a pool of processes, so that no
+    process holds the whole grid. Every process gets the segments that meet
+    its tile, clips them to it and rasterizes them. A cell costs 12 bytes
+    (its int32 count, and bincount's int64 count), and each cell of a batch
+    of rasterize 16 bytes, so we give three quarters of the memory budget to
+    the tile, and the rest to the batches.
+    """
+    from concurrent.futures import ProcessPoolExecutor
 
-    return count_overlapping_lines(grid)
+    tile_cells = get_tile_cells(memory_per_worker)
+    batch_cells = max(1, memory_per_worker // 4 // 16)
+    tiles = get_tiles(shape, tile_cells)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        counts = pool.map(
+            count_tile,
+            (in_tile(segments, tile) for tile in tiles),
+            tiles,
+            repeat(batch_cells),
+        )
+        return sum(counts)
+
+
+def is_sparse(
+    segments: "np.ndarray",
+    shape: Tuple[int, int],
+    jobs: Optional[int] = 1,
+    memory_per_worker: int = MEMORY_PER_WORKER,
+) -> bool:
+    """
+    Whether to sweep over the segments rather than rasterize them. One
+    process rasterizes grids of up to MAX_GRID_CELLS cells. A pool of
+    processes rasterizes larger grids too, as long as the segments cover
+    enough of them (see MIN_DENSITY), and they fit in MAX_TILES_PER_WORKER
+    tiles per process.
+    """
+    cols, rows = shape
+    if cols * rows <= MAX_GRID_CELLS:
+        return False
+    if jobs == 1:
+        return True
+
+    x1, y1, x2, y2 = segments.T
+    cells = int((abs(x2 - x1).clip(min=abs(y2 - y1)) + 1).sum())
+    workers = jobs or os.cpu_count() or 1
+    max_cells = workers * MAX_TILES_PER_WORKER * get_tile_cells(memory_per_worker)
+    return cols * rows > max_cells or cells < cols * rows * MIN_DENSITY
+
+
+def count_overlaps(
+    segments: "np.ndarray",
+    shape: Tuple[int, int],
+    sparse: Optional[bool] = None,
+    jobs: int = 1,
+) -> int:
+    """
+    Rasterizes the segments when the grid is small enough, and sweeps over
+    them otherwise (or when sparse is given). Coordinates like 10^7 would
+    make the grid blow up, while the sweep doesn't depend on them.
+    With more than one job (None: one per CPU core), the grid is rasterized
+    tile by tile on a pool of processes instead, so that no process holds
+    the whole grid, and the grids too large for one process are only swept
+    over when they are sparse, see is_sparse().
+    """
+    if sparse is None:
+        sparse = is_sparse(segments, shape, jobs)
+    if sparse:
+        return sweep.count_overlaps(segments.tolist())
+    if jobs != 1:
+        return parallel_overlaps(segments, shape, jobs)
+    return count_overlapping_lines(rasterize(segments, shape))
+
+
+def part_1(
+    segments: "np.ndarray", sparse: Optional[bool] = None, jobs: int = 1
+) -> int:
+    non_diagonals, _ = get_lines(segments)
+    return count_overlaps(non_diagonals, get_grid_size(segments), sparse, jobs)
+
+
+def part_2(
+    segments: "np.ndarray", sparse: Optional[bool] = None, jobs: int = 1
+) -> int:
+    return count_overlaps(segments, get_grid_size(segments), sparse, jobs)
 
 
 if __name__ == "__main__":
-    content = read_input("input.txt")
-    points = get_list_of_points(content)
-    print(part_1(points))
-    print(part_2(points))
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    points = parse_input("input.txt")
+    sparse = True if "--sparse" in sys.argv else None
+    jobs = None if "--parallel" in sys.argv else 1
+    print(part_1(points, sparse, jobs))
+    print(part_2(points, sparse, jobs))
@@ -2,6 +2,8 @@ from typing import List
 
 
 class Point:
+    __slots__ = ("x", "y")
+
     def __init__(self, pair: List[str]):
         self.x = int(pair[0])
         self.y = int(pair[1])
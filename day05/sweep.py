@@ -0,0 +1,209 @@
+"""
+Counting the points where vent lines overlap without a grid, for inputs whose
+coordinates are too large for one. Time and memory depend on the number of
+lines and of their crossings, not on the size of the plane.
+
+The lines fall into four families: horizontal, vertical, and the two
+diagonals. All the lines of a family are parallel, and each of them is told
+apart by a key, the value of a linear form that is constant along it:
+y for the horizontal lines, x for the vertical ones, y - x and x + y for the
+diagonals (see FORMS). A point on a line is then given by its parameter t:
+x, or y for the vertical lines.
+
+A point is an overlap when it is covered twice by lines of the same family,
+which happens on the collinear parts of the lines, or by lines of two
+different families, where they cross:
+- on each line, a sweep over the ends of the segments on it gives the
+  intervals that are covered at least once, and the ones covered at least
+  twice, which we count directly.
+- the crossings of two families are found with a sweep line, on the union
+  intervals of their lines. In the plane of (key of the first family, key of
+  the second one), every interval of the first family is a horizontal
+  segment and every interval of the second one a vertical segment, so the
+  same sweep works for every pair of families.
+A crossing that is also covered twice within a family was counted already,
+and one that is covered twice within two families was counted twice.
+"""
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from itertools import combinations, groupby
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+HORIZONTAL, VERTICAL, DIAGONAL_UP, DIAGONAL_DOWN = range(4)
+
+# The linear form (cx, cy) of each family, i.e its key is cx * x + cy * y.
+FORMS = ((0, 1), (1, 0), (-1, 1), (1, 1))
+
+# The order of the events of the sweep that happen at the same position.
+REMOVE, ADD, QUERY = range(3)
+
+Interval = Tuple[int, int]
+Lines = Dict[int, List[Interval]]
+
+
+def classify(x1: int, y1: int, x2: int, y2: int) -> Tuple[int, int, int, int]:
+    """
+    The family and the key of the segment's line, and the interval of t that
+    it covers.
+    """
+    if y1 == y2:
+        return HORIZONTAL, y1, min(x1, x2), max(x1, x2)
+    if x1 == x2:
+        return VERTICAL, x1, min(y1, y2), max(y1, y2)
+    if x2 - x1 == y2 - y1:
+        return DIAGONAL_UP, y1 - x1, min(x1, x2), max(x1, x2)
+    if x2 - x1 == y1 - y2:
+        return DIAGONAL_DOWN, x1 + y1, min(x1, x2), max(x1, x2)
+    raise ValueError(
+        f"{x1},{y1} -> {x2},{y2} is not horizontal, vertical or diagonal"
+    )
+
+
+def key(family: int, x: int, y: int) -> int:
+    cx, cy = FORMS[family]
+    return cx * x + cy * y
+
+
+def param(family: int, x: int, y: int) -> int:
+    return y if family == VERTICAL else x
+
+
+def point(family: int, k: int, t: int) -> Tuple[int, int]:
+    if family == HORIZONTAL:
+        return t, k
+    if family == VERTICAL:
+        return k, t
+    if family == DIAGONAL_UP:
+        return t, t + k
+    return t, k - t
+
+
+def solve(f: int, a: int, g: int, b: int) -> Optional[Tuple[int, int]]:
+    """
+    The point where the line a of family f crosses the line b of family g,
+    or None if it isn't a point of the grid (the two diagonals only cross on
+    one when a and b have the same parity).
+    """
+    (fx, fy), (gx, gy) = FORMS[f], FORMS[g]
+    det = fx * gy - fy * gx
+    x, rx = divmod(a * gy - fy * b, det)
+    y, ry = divmod(fx * b - a * gx, det)
+    return None if rx or ry else (x, y)
+
+
+def coverage(intervals: Iterable[Interval]) -> Tuple[List[Interval], List[Interval]]:
+    """
+    The intervals (in order) covered at least once, and at least twice, by
+    the intervals of one line.
+    """
+    events = []
+    for lo, hi in intervals:
+        events.append((lo, 1))
+        events.append((hi + 1, -1))
+    events.sort()
+
+    union, overlaps = [], []
+    depth = 0
+    for pos, group in groupby(events, key=itemgetter(0)):
+        before = depth
+        depth += sum(delta for _, delta in group)
+        if before < 1 <= depth:
+            union_start = pos
+        elif depth < 1 <= before:
+            union.append((union_start, pos - 1))
+        if before < 2 <= depth:
+            overlap_start = pos
+        elif depth < 2 <= before:
+            overlaps.append((overlap_start, pos - 1))
+
+    return union, overlaps
+
+
+def _span(f: int, k: int, interval: Interval, g: int) -> Tuple[int, int]:
+    """
+    The range of the keys of family g along an interval of the line k of
+    family f.
+    """
+    k1 = key(g, *point(f, k, interval[0]))
+    k2 = key(g, *point(f, k, interval[1]))
+    return min(k1, k2), max(k1, k2)
+
+
+def crossings(
+    f: int, lines_f: Lines, g: int, lines_g: Lines
+) -> Iterator[Tuple[int, int]]:
+    """
+    The points where the intervals of family f cross those of family g. We
+    sweep over the keys of g: an interval of f is active over the range of g
+    keys that it spans, and each interval of g looks up the active lines of f
+    (kept sorted by key) within the range of f keys that it spans.
+    """
+    events = []
+    for a, intervals in lines_f.items():
+        for interval in intervals:
+            lo, hi = _span(f, a, interval, g)
+            events.append((lo, ADD, a))
+            events.append((hi + 1, REMOVE, a))
+    for b, intervals in lines_g.items():
+        for interval in intervals:
+            lo, hi = _span(g, b, interval, f)
+            events.append((b, QUERY, lo, hi))
+    events.sort()
+
+    active: List[int] = []
+    for event in events:
+        if event[1] == REMOVE:
+            active.pop(bisect_left(active, event[2]))
+        elif event[1] == ADD:
+            insort(active, event[2])
+        else:
+            b, _, lo, hi = event
+            for a in active[bisect_left(active, lo) : bisect_right(active, hi)]:
+                p = solve(f, a, g, b)
+                if p is not None:
+                    yield p
+
+
+def is_covered(lines: Lines, k: int, t: int) -> bool:
+    intervals = lines.get(k)
+    if not intervals:
+        return False
+    i = bisect_right(intervals, (t, math.inf)) - 1
+    return i >= 0 and intervals[i][1] >= t
+
+
+def count_overlaps(segments: Sequence[Sequence[int]]) -> int:
+    """
+    The number of points covered by at least two of the segments.
+    """
+    lines: List[Lines] = [defaultdict(list) for _ in FORMS]
+    for x1, y1, x2, y2 in segments:
+        family, k, lo, hi = classify(x1, y1, x2, y2)
+        lines[family][k].append((lo, hi))
+
+    unions: List[Lines] = [{} for _ in FORMS]
+    overlaps: List[Lines] = [{} for _ in FORMS]
+    total = 0
+    for family, family_lines in enumerate(lines):
+        for k, intervals in family_lines.items():
+            union, multiple = coverage(intervals)
+            unions[family][k] = union
+            if multiple:
+                overlaps[family][k] = multiple
+                total += sum(hi - lo + 1 for lo, hi in multiple)
+
+    crossed = set()
+    for f, g in combinations(range(len(FORMS)), 2):
+        crossed.update(crossings(f, unions[f], g, unions[g]))
+
+    overlapping = [f for f in range(len(FORMS)) if overlaps[f]]
+    for x, y in crossed:
+        counted = sum(
+            is_covered(overlaps[f], key(f, x, y), param(f, x, y))
+            for f in overlapping
+        )
+        total += 1 - counted
+
+    return total
@@ -1,9 +1,16 @@
-from typing import List
+from operator import mul
+from typing import Dict, Iterable, List, Optional, Tuple
 from pathlib import Path
-from collections import defaultdict
+
+# A fish's timer goes from 8 down to 0.
+TIMERS = 9
+
+Matrix = List[List[int]]
 
 
 class Fish:
+    __slots__ = ("timer", "freeze_timer")
+
     def __init__(self, timer: int, freeze: int = 0):
         self.timer = timer
         self.freeze_timer = freeze
@@ -39,9 +46,13 @@ def read_input(filename: str) -> List[str]:
     return content
 
 
-def part_1(content: List[int]) -> int:
+def parse_input(filename: str = "input.txt") -> Tuple[int, ...]:
+    return tuple(read_input(filename))
+
+
+def simulate_fish(content: List[int]) -> int:
     """
-    The solution in part_2 is much faster, but keeping this for demonstration 
+    The solution in part_1 is much faster, but keeping this for demonstration 
     purposes. 
 
     This method basically stores all the fish objects in a list, and keeps 
@@ -68,38 +79,144 @@ def part_1(content: List[int]) -> int:
     return len(all_fish)
 
 
-def part_2(content: List[int]) -> int:
+def timer_counts(content: List[int]) -> List[int]:
     """
-    Instead of storing all of the actual fish and their timers, we can simply 
-    use a dictionary to keep track of the *counts* of the different fish with a 
-    specific timer, and change them all directly. 
+    Instead of storing all of the actual fish and their timers, we only keep
+    track of the *counts* of the fish with each timer.
     """
-    counts = defaultdict(int)
+    counts = [0] * TIMERS
     for timer in content:
         counts[timer] += 1
+    return counts
 
-    for i in range(256):
-        # store the intermediate updates so we don't modify the original
-        # dictionary.
-        temp = defaultdict(int)
-        for timer, count in sorted(counts.items(), reverse=True):
-            if timer >= 1:
-                new_timer = timer - 1
-                temp[new_timer] += count
-                temp[timer] -= count
-            else:
-                temp[timer] -= count
-                temp[6] += count
-                temp[8] += count
 
-        for timer, count in temp.items():
-            counts[timer] += count
+def transition_matrix() -> Matrix:
+    """
+    The matrix T such that the counts of the next day are T times the counts
+    of today: a fish with a timer t > 0 gets the timer t - 1, and a fish with
+    a timer of 0 gets the timer 6 and makes a new fish with a timer of 8.
+    """
+    matrix = [[0] * TIMERS for _ in range(TIMERS)]
+    for timer in range(1, TIMERS):
+        matrix[timer - 1][timer] = 1
+    matrix[6][0] = 1
+    matrix[8][0] = 1
+    return matrix
 
-    return sum(counts.values())
+
+TRANSITION = transition_matrix()
+
+
+def mat_mul(a: Matrix, b: Matrix, modulus: Optional[int] = None) -> Matrix:
+    columns = list(zip(*b))
+    product = [[sum(map(mul, row, col)) for col in columns] for row in a]
+    if modulus:
+        product = [[x % modulus for x in row] for row in product]
+    return product
+
+
+def mat_vec(a: Matrix, v: List[int], modulus: Optional[int] = None) -> List[int]:
+    product = [sum(map(mul, row, v)) for row in a]
+    if modulus:
+        product = [x % modulus for x in product]
+    return product
+
+
+def advance(
+    counts: List[int],
+    days: int,
+    modulus: Optional[int] = None,
+    matrix: Matrix = TRANSITION,
+) -> List[int]:
+    """
+    The counts of each timer after the given days. They are T^n times the
+    counts, and we get T^n by squaring: T, T^2, T^4, ... and apply the powers
+    of the bits of n to the counts, so it takes O(log(days)) 9x9 matrix
+    products.
+    """
+    if days < 0:
+        raise ValueError(f"days can't be negative, got {days}")
+
+    power = matrix
+    while days:
+        if days & 1:
+            counts = mat_vec(power, counts, modulus)
+        days >>= 1
+        if days:
+            power = mat_mul(power, power, modulus)
+
+    return counts
+
+
+def count_fish(
+    counts: List[int], days: int, modulus: Optional[int] = None
+) -> int:
+    """
+    The number of fish after the given days, from the counts of each timer.
+
+    The exact number of fish grows by about 9% a day, i.e it has about
+    days / 26 digits, so exact counts are only practical for up to ~10^6
+    days. With a modulus, every product is reduced, and even 10^18 days take
+    a few milliseconds.
+    """
+    total = sum(advance(counts, days, modulus))
+    return total % modulus if modulus else total
+
+
+class ResponseTable:
+    """
+    How many fish a single fish with the timer t turns into after d days, for
+    every timer t and every d of a set of horizons. The number of fish is
+    linear in the counts of the timers, so the table answers any population
+    with a 9-term dot product of its counts.
+
+    The responses after d days are the sums of the columns of T^d, i.e
+    (1, ..., 1) T^d, or T^d transposed times (1, ..., 1). So we advance a
+    vector of ones through the sorted horizons with the transposed matrix,
+    and only pay for the gaps between them.
+    """
+
+    def __init__(self, horizons: Iterable[int], modulus: Optional[int] = None):
+        self.modulus = modulus
+        self.responses: Dict[int, List[int]] = {}
+        transposed = [list(column) for column in zip(*TRANSITION)]
+        response, day = [1] * TIMERS, 0
+        for horizon in sorted(set(horizons)):
+            response = advance(response, horizon - day, modulus, transposed)
+            self.responses[horizon] = response
+            day = horizon
+
+    def count(self, counts: List[int], days: int) -> int:
+        """
+        The number of fish after the given days, from the counts of each
+        timer, like count_fish.
+        """
+        if days not in self.responses:
+            raise ValueError(f"{days} days isn't one of the horizons of the table")
+
+        total = sum(map(mul, self.responses[days], counts))
+        return total % self.modulus if self.modulus else total
+
+    def count_populations(
+        self, populations: Iterable[List[int]], days: int
+    ) -> List[int]:
+        """
+        The number of fish after the given days for each population, given as
+        the timers of its fish like the puzzle input.
+        """
+        return [self.count(timer_counts(timers), days) for timers in populations]
+
+
+def part_1(content: List[int]) -> int:
+    return count_fish(timer_counts(content), 80)
+
+
+def part_2(content: List[int]) -> int:
+    return count_fish(timer_counts(content), 256)
 
 
 if __name__ == "__main__":
-    content = read_input("input.txt")
+    content = parse_input("input.txt")
     print(f"part 1: {part_1(content)}")
     print(f"part 2: {part_2(content)}")
 
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 from pathlib import Path
 
 
@@ -13,6 +13,10 @@ def read_input(filename: str) -> List[str]:
     return content
 
 
+def parse_input(filename: str = "input.txt") -> Tuple[int, ...]:
+    return tuple(read_input(filename))
+
+
 def partial_sum(n: int) -> int:
     return (n * (n + 1)) // 2
 
@@ -46,6 +50,6 @@ def part_2(content: List[str]) -> int:
 
 
 if __name__ == "__main__":
-    content = read_input("input.txt")
+    content = parse_input("input.txt")
     print(f"part 1: {part_1(content)}")
     print(f"part 2: {part_2(content)}")
@@ -1,5 +1,5 @@
 from collections import defaultdict
-from typing import List, Pattern, Set, Dict
+from typing import List, Pattern, Set, Dict, Tuple
 from pathlib import Path
 
 
@@ -14,6 +14,12 @@ def read_input(filename: str) -> List[str]:
     return content
 
 
+def parse_input(filename: str = "input.txt") -> Tuple[Tuple[Tuple[str, ...], ...], ...]:
+    return tuple(
+        tuple(tuple(patterns) for patterns in row) for row in read_input(filename)
+    )
+
+
 def part_1(content: List[str]) -> int:
     """
     The easy digits: 1, 4, 7 and 8 each has a unique length.
@@ -136,6 +142,6 @@ def part_2(content: List[str]) -> int:
 
 
 if __name__ == "__main__":
-    content = read_input("input.txt")
+    content = parse_input("input.txt")
     print(f"part 1: {part_1(content)}")
     print(f"part 2: {part_2(content)}")
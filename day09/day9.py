@@ -1,11 +1,24 @@
-from typing import List, Tuple, Set
-from collections import deque
+import sys
+from typing import TYPE_CHECKING, List, Optional, Tuple, Set
+from collections import deque, namedtuple
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from aoc.grid import Grid
+
+# The parsed heightmap. Both parts start from the low points, so we find them
+# once while parsing.
+Heightmap = namedtuple("Heightmap", ["matrix", "low_points"])
+
+# The height of the cells around the heightmap. It is higher than any point,
+# so the border never makes a point lose its low point status, and never
+# joins a basin (which stops at the points of height 9).
+BORDER = 10
+
 
 # assuming that the input file is in the same folder as this script.
-def read_input() -> List[str]:
-    path_to_input = Path(__file__).parent / "input.txt"
+def read_input(filename: str = "input.txt") -> List[str]:
+    path_to_input = Path(__file__).parent / filename
     with open(path_to_input) as f:
         content = f.readlines()
 
@@ -13,77 +26,56 @@ def read_input() -> List[str]:
     return content
 
 
-def is_within_boundaries(i: int, j: int, rows: int, cols: int) -> bool:
-    return i >= 0 and i < rows and j >= 0 and j < cols
-
-
 # a point is a lowpoint if its height is lower than all of its neighbours
-def is_lowpoint(matrix: List[List[int]], i: int, j: int) -> bool:
-    directions = [[-1, 0], [0, 1], [1, 0], [0, -1]]  # left, up, right, down
-    curr_point = matrix[i][j]
-
-    for direction in directions:
-        # neighbour coordinate
-        r, c = direction[0] + i, direction[1] + j
-        if (
-            is_within_boundaries(r, c, len(matrix), len(matrix[0]))
-            and curr_point >= matrix[r][c]
-        ):
-            return False
-
-    return True
+def find_lowpoints(matrix: "Grid") -> List[Tuple[int, int]]:
+    is_lowpoint = matrix.cells < BORDER
+    for neighbour in matrix.neighbours():
+        is_lowpoint &= matrix.cells < neighbour
 
+    rows, cols = is_lowpoint.nonzero()
+    return list(zip(rows.tolist(), cols.tolist()))
 
-def find_lowpoints(str_input: List[str]) -> List[Tuple[int, int]]:
-    matrix = [[int(col) for col in rows] for rows in str_input]
-    low_points = []
-    rows = len(matrix)
-    cols = len(matrix[0])
 
-    for i in range(rows):
-        for j in range(cols):
-            if is_lowpoint(matrix, i, j):
-                low_points.append((i, j))
+def parse_input(filename: str = "input.txt") -> Heightmap:
+    from aoc.grid import Grid
 
-    return low_points
+    matrix = Grid.from_lines(read_input(filename), fill=BORDER).freeze()
+    return Heightmap(matrix, tuple(find_lowpoints(matrix)))
 
 
 def get_valid_neighbours(
-    matrix: List[List[int]], i: int, j: int, visited: Set[Tuple[int, int]]
-) -> List[Tuple[int, int]]:
+    heights: List[int], offsets: Tuple[int, ...], i: int, visited: Set[int]
+) -> List[int]:
 
     """
-    The coordinate (i, j) represents the current point we are looking at. 
-    (r, c) represents the neighbouring coordinates. 
+    i is the flat index of the current point we are looking at in the
+    padded heightmap, and heights the padded heightmap as a flat list.
+    The neighbours of i are at i + offset, for each of the offsets.
     """
-    directions = [[-1, 0], [0, 1], [1, 0], [0, -1]]  # left, up, right, down
-    curr_height = matrix[i][j]
+    curr_height = heights[i]
     valid_neighbours = []
 
-    for direction in directions:
-        # neighbour coordinate
-        r, c = direction[0] + i, direction[1] + j
-        if (
-            is_within_boundaries(r, c, len(matrix), len(matrix[0]))
-            and (r, c) not in visited
-            and matrix[r][c] != 9
-            and matrix[r][c] > curr_height
-        ):
-            valid_neighbours.append((r, c))
+    for offset in offsets:
+        n = i + offset
+        if n not in visited and curr_height < heights[n] < 9:
+            valid_neighbours.append(n)
 
     return valid_neighbours
 
 
-def bfs(matrix: List[List[int]], low_point: Tuple[int, int]) -> int:
+def bfs(
+    matrix: "Grid", low_point: Tuple[int, int], heights: Optional[List[int]] = None
+) -> int:
+    heights = heights or matrix.values()
     queue = deque()
     visited = set()
     curr_basin = []
 
-    queue.append(low_point)
+    queue.append(matrix.index(*low_point))
     while queue:
-        i, j = queue.popleft()
-        curr_basin.append((i, j))
-        neighbours = get_valid_neighbours(matrix, i, j, visited)
+        i = queue.popleft()
+        curr_basin.append(matrix.position(i))
+        neighbours = get_valid_neighbours(heights, matrix.offsets_4, i, visited)
 
         for neighbour in neighbours:
             visited.add(neighbour)
@@ -92,17 +84,16 @@ def bfs(matrix: List[List[int]], low_point: Tuple[int, int]) -> int:
     return curr_basin
 
 
-def part_1(content: List[str]) -> int:
+def part_1(heightmap: Heightmap) -> int:
     """
     Finding all the low points is pretty simple. Just check if a point's height
     is lower than all of its valid neighbours. 
     """
-    matrix = [[int(x) for x in numbers] for numbers in content]
-    low_points = find_lowpoints(matrix)
-    return sum([matrix[p[0]][p[1]] + 1 for p in low_points])
+    matrix, low_points = heightmap
+    return sum([int(matrix.cells[p]) + 1 for p in low_points])
 
 
-def part_2(content: List[str]) -> int:
+def part_2(heightmap: Heightmap) -> int:
     """
     The idea is to:
     1. find all the existing low points. 
@@ -111,12 +102,12 @@ def part_2(content: List[str]) -> int:
     3. multiply the top 3 largest basins. 
     """
 
-    matrix = [[int(x) for x in numbers] for numbers in content]
+    matrix, low_points = heightmap
+    heights = matrix.values()
     basins = []
-    low_points = find_lowpoints(matrix)
 
     for low_point in low_points:
-        basins.append(bfs(matrix, low_point))
+        basins.append(bfs(matrix, low_point, heights))
 
     basins.sort(key=lambda x: len(x), reverse=True)
 
@@ -128,6 +119,7 @@ def part_2(content: List[str]) -> int:
 
 
 if __name__ == "__main__":
-    content = read_input()
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    content = parse_input()
     print(f"part 1: {part_1(content)}")
     print(f"part 2: {part_2(content)}")
@@ -1,7 +1,15 @@
-from typing import Deque, List, Set, Tuple
+import sys
+from typing import TYPE_CHECKING, Deque, List, Set, Tuple
 from pathlib import Path
 from collections import deque
 
+if TYPE_CHECKING:
+    from aoc.grid import Grid
+
+# The fill of the border of the grid. An energy is never negative, so the
+# BFS tells the border apart from the octopuses without checking the bounds.
+BORDER = -1
+
 
 def read_input(filename: str) -> List[str]:
     path_to_input = Path(__file__).parent / filename
@@ -13,51 +21,68 @@ def read_input(filename: str) -> List[str]:
     return content
 
 
-def is_within_bounds(grid: List[List[int]], y: int, x: int):
-    return y >= 0 and y < len(grid) and x >= 0 and x < len(grid[0])
+def parse_input(filename: str = "input.txt") -> "Grid":
+    """
+    Both parts update the grid in place, so we keep the parsed grid read-only
+    and let each part work on its own copy of its values.
+    """
+    from aoc.grid import Grid
+
+    return Grid(read_input(filename), fill=BORDER).freeze()
 
 
-def bfs(
-    grid: List[List[int]], q: Deque[Tuple[int, int]], exploded: Set[int], flashes: int
-) -> List[List[int]]:
-    directions = [[0, -1], [-1, -1], [-1, 0], [-1, 1], [0, 1], [1, 1], [1, 0], [1, -1]]
+def inside(grid: "Grid") -> List[int]:
+    """
+    The flat indices of the cells of the grid, without the border.
+    """
+    return [grid.index(r, c) for r in range(grid.rows) for c in range(grid.cols)]
+
 
+def bfs(
+    grid: List[int],
+    offsets: Tuple[int, ...],
+    q: Deque[int],
+    exploded: Set[int],
+    flashes: int,
+) -> Tuple[List[int], Set[int], int]:
+    """
+    grid holds the values of the padded grid, one per flat index, and the
+    neighbours of the index i are i + offset for the offsets of the grid.
+    """
     while q:
         curr = q.popleft()
         flashes += 1
-        y, x = curr
-        for d in directions:
-            y = d[0] + curr[0]
-            x = d[1] + curr[1]
-            if is_within_bounds(grid, y, x) and (y, x) not in exploded:
-                if grid[y][x] == 9:
-                    q.append((y, x))
-                    grid[y][x] = 0
-                    exploded.add((y, x))
+        for d in offsets:
+            i = curr + d
+            if grid[i] != BORDER and i not in exploded:
+                if grid[i] == 9:
+                    q.append(i)
+                    grid[i] = 0
+                    exploded.add(i)
                 else:
-                    grid[y][x] += 1
+                    grid[i] += 1
 
     return grid, exploded, flashes
 
 
-def is_all_zeroes(grid: List[List[int]]) -> bool:
-    for r in grid:
-        for c in r:
-            if c != 0:
-                return False
+def is_all_zeroes(grid: List[int], cells: List[int]) -> bool:
+    for i in cells:
+        if grid[i] != 0:
+            return False
     return True
 
 
-def part_1(grid: List[List[int]], n: int) -> int:
+def part_1(grid: "Grid", n: int) -> int:
     """
     Overall, we use a BFS to iterate over the neighbours of the entries that
     have a value of 9 before we increment. If an entry's value is 9, we add
-    its coordinates to a queue that we will perform the BFS with.
+    its index to a queue that we will perform the BFS with.
     We maintain a separate grid variable, to keep the "previous" state of the
     grid such that we still know which entries should explode.
     """
-    rows = len(grid)
-    cols = len(grid[0])
+    cells = inside(grid)
+    offsets = grid.offsets_8
+    grid = grid.values()
     exploded = set()
     flashes = 0
 
@@ -66,28 +91,28 @@ def part_1(grid: List[List[int]], n: int) -> int:
         exploded = set()
         new_grid = grid
 
-        for r in range(rows):
-            for c in range(cols):
-                if grid[r][c] == 9:
-                    q.append((r, c))
-                    exploded.add((r, c))
-                    new_grid[r][c] = 0
-                elif (r, c) not in exploded:
-                    new_grid[r][c] += 1
+        for i in cells:
+            if grid[i] == 9:
+                q.append(i)
+                exploded.add(i)
+                new_grid[i] = 0
+            elif i not in exploded:
+                new_grid[i] += 1
 
-        new_grid, exploded, flashes = bfs(new_grid, q, exploded, flashes)
+        new_grid, exploded, flashes = bfs(new_grid, offsets, q, exploded, flashes)
         grid = new_grid
 
     return flashes
 
 
-def part_2(grid: List[List[int]], n: int) -> int:
+def part_2(grid: "Grid", n: int) -> int:
     """
     Similary approach as in part_1. Except after each BFS, we check if all the
     values of the grid is 0 and return the iteration at which this happens.
     """
-    rows = len(grid)
-    cols = len(grid[0])
+    cells = inside(grid)
+    offsets = grid.offsets_8
+    grid = grid.values()
     exploded = set()
     step = 0
 
@@ -95,19 +120,18 @@ def part_2(grid: List[List[int]], n: int) -> int:
         q = deque()
         exploded = set()
         new_grid = grid
-        for r in range(rows):
-            for c in range(cols):
-                if grid[r][c] == 9:
-                    q.append((r, c))
-                    exploded.add((r, c))
-                    new_grid[r][c] = 0
-                elif (r, c) not in exploded:
-                    new_grid[r][c] += 1
-
-        new_grid, exploded, _ = bfs(new_grid, q, exploded, 0)
+        for c in cells:
+            if grid[c] == 9:
+                q.append(c)
+                exploded.add(c)
+                new_grid[c] = 0
+            elif c not in exploded:
+                new_grid[c] += 1
+
+        new_grid, exploded, _ = bfs(new_grid, offsets, q, exploded, 0)
         grid = new_grid
 
-        if is_all_zeroes(grid):
+        if is_all_zeroes(grid, cells):
             step = i + 1
             break
 
@@ -115,7 +139,7 @@ def part_2(grid: List[List[int]], n: int) -> int:
 
 
 if __name__ == "__main__":
-    content_1 = read_input("input.txt")
-    content_2 = read_input("input.txt")
-    print(f"part 1: {part_1(content_1, 100)}")
-    print(f"part 2: {part_2(content_2, 300)}")
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    grid = parse_input("input.txt")
+    print(f"part 1: {part_1(grid, 100)}")
+    print(f"part 2: {part_2(grid, 300)}")
@@ -1,8 +1,11 @@
 from collections import defaultdict
-from os import urandom
-from typing import List, Dict, Set
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Set, Tuple
 from pathlib import Path
 
+# The caves that each cave leads to.
+Graph = Mapping[str, Tuple[str, ...]]
+
 
 def read_input(filename: str) -> List[str]:
     path_to_input = Path(__file__).parent / filename
@@ -25,7 +28,19 @@ def build_graph(content: List[str]) -> Dict[str, List[str]]:
     return graph
 
 
-def dfs_part1(graph: Dict[str, List[str]], visited: Set[str], curr: str) -> int:
+def parse_input(filename: str = "input.txt") -> Graph:
+    """
+    The graph is shared by both parts, so it is read-only: a plain dict of
+    tuples behind a mapping proxy. Every cave is a key, even the ones that
+    don't lead anywhere.
+    """
+    content = read_input(filename)
+    graph = build_graph(content)
+    caves = dict.fromkeys(cave for edge in content for cave in edge)
+    return MappingProxyType({cave: tuple(graph[cave]) for cave in caves})
+
+
+def dfs_part1(graph: Graph, visited: Set[str], curr: str) -> int:
     if curr == "end":
         return 1
 
@@ -45,7 +60,7 @@ def dfs_part1(graph: Dict[str, List[str]], visited: Set[str], curr: str) -> int:
     return total_paths
 
 
-def dfs_part2(graph: Dict[str, List[str]], visited: Dict[str, int], curr: str) -> int:
+def dfs_part2(graph: Graph, visited: Dict[str, int], curr: str) -> int:
 
     # If we are currently visiting a small cave and have already visited a
     # small cave once. Or if we visit the same cave for the third time.
@@ -69,17 +84,16 @@ def dfs_part2(graph: Dict[str, List[str]], visited: Dict[str, int], curr: str) -
     return total_paths
 
 
-def part_1(content: List[str]) -> int:
+def part_1(graph: Graph) -> int:
     """
     We use a standard recursive DFS to count the number of paths from 'start' 
     to 'end'. Use a hashset to keep track of the visited small caves. 
     """
     visited = set()
-    graph = build_graph(content)
     return dfs_part1(graph, visited, "start")
 
 
-def part_2(content: List[str]) -> int:
+def part_2(graph: Graph) -> int:
     """
     Almost similar to part_1, but use a hashmap to keep track of the currently
     visited small caves. If a small cave is being visited more than 2 times or
@@ -87,11 +101,10 @@ def part_2(content: List[str]) -> int:
     already been visited twice, we return 0 from that path. 
     """
     visited = defaultdict(int)
-    graph = build_graph(content)
     return dfs_part2(graph, visited, "start")
 
 
 if __name__ == "__main__":
-    content = read_input("input.txt")
-    print(f"part 1: {part_1(content)}")
-    print(f"part 2: {part_2(content)}")
+    graph = parse_input("input.txt")
+    print(f"part 1: {part_1(graph)}")
+    print(f"part 2: {part_2(graph)}")
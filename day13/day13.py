@@ -1,7 +1,12 @@
-from typing import List, Tuple, Set
+import sys
+from typing import TYPE_CHECKING, List, Tuple
 from pathlib import Path
 from collections import namedtuple
-from prettytable import PrettyTable
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from aoc.grid import Grid
 
 FoldOp = namedtuple("FoldOp", ["dim", "pos"])
 Point = namedtuple("Point", ["x", "y"])
@@ -24,53 +29,97 @@ def read_input(filename: str) -> Tuple[List[Point], List[FoldOp]]:
     return points, fold_ops
 
 
+def parse_input(filename: str = "input.txt") -> Tuple[Tuple[Point, ...], Tuple[FoldOp, ...]]:
+    points, fold_ops = read_input(filename)
+    return tuple(points), tuple(fold_ops)
+
+
 def boundaries(points: List[Point]) -> Tuple[int, int]:
     max_x = max(point.x for point in points)
     max_y = max(point.y for point in points)
     return max_x, max_y
 
 
-def fold_x(points: Set[Point], fold_op: FoldOp) -> Set[Point]:
-    new_points = set()
-    for p in points:
-        if p.x > fold_op.pos:
-            dist = (p.x - fold_op.pos) * 2
-            new_x = p.x - dist
-            new_points.add(Point(new_x, p.y))
-        else:
-            new_points.add(p)
+def to_paper(points: List[Point]) -> "Grid":
+    """
+    The transparent paper as a grid, that holds True for the dots.
+    """
+    from aoc.grid import Grid
 
-    return new_points
+    max_x, max_y = boundaries(points)
+    paper = Grid.zeros(max_y + 1, max_x + 1, pad=0, dtype=bool)
+    paper.cells[[p.y for p in points], [p.x for p in points]] = True
+    return paper
 
 
-def fold_y(points: Set[Point], fold_op: FoldOp) -> Set[Point]:
-    new_points = set()
-    for p in points:
-        if p.y > fold_op.pos:
-            dist = (p.y - fold_op.pos) * 2
-            new_y = p.y - dist
-            new_points.add(Point(p.x, new_y))
-        else:
-            new_points.add(p)
+def fold_columns(
+    cells: "np.ndarray", pos: int, origin: int
+) -> Tuple["np.ndarray", int]:
+    """
+    Folds the columns of cells right of the line x = pos onto the ones left
+    of it, i.e the column at pos + d lands on the column at pos - d. The
+    first column of cells is at x = origin, and we return the folded columns
+    together with the x of their first column: when the part right of the
+    line is the wider one, the folded paper starts left of origin.
+
+    The columns on each side of the line land on distinct columns, so each
+    side is laid over the result with a single fancy-indexed OR.
+    """
+    import numpy as np
 
-    return new_points
+    xs = origin + np.arange(cells.shape[1])
+    folded = np.where(xs > pos, 2 * pos - xs, xs)
+    if not len(folded):
+        return cells, origin
 
+    new_origin = int(folded.min())
+    result = np.zeros((cells.shape[0], int(folded.max()) - new_origin + 1), bool)
+    for side in (xs <= pos, xs > pos):
+        result[:, folded[side] - new_origin] |= cells[:, side]
+    return result, new_origin
 
-def fold(points: List[Point], fold_ops: List[FoldOp], part_1: bool) -> Set[Point]:
-    updated_points = points
+
+def fold_x(paper: "Grid", fold_op: FoldOp, x0: int = 0) -> Tuple["Grid", int]:
+    """
+    Folds the paper, whose first column is at x0, along x = pos. Returns the
+    folded paper and the x of its first column.
+    """
+    from aoc.grid import Grid
+
+    cells, x0 = fold_columns(paper.cells, fold_op.pos, x0)
+    return Grid(cells, pad=0, dtype=bool), x0
+
+
+def fold_y(paper: "Grid", fold_op: FoldOp, y0: int = 0) -> Tuple["Grid", int]:
+    """
+    Same as fold_x, with the rows as the columns of the transposed paper.
+    """
+    from aoc.grid import Grid
+
+    cells, y0 = fold_columns(paper.cells.T, fold_op.pos, y0)
+    return Grid(cells.T, pad=0, dtype=bool), y0
+
+
+def fold(
+    points: List[Point], fold_ops: List[FoldOp], part_1: bool
+) -> Tuple["Grid", int, int]:
+    """
+    The folds are at absolute coordinates, so we keep track of the
+    coordinates (x0, y0) of the top left cell of the paper, and return them
+    with it.
+    """
+    paper = to_paper(points)
+    x0, y0 = 0, 0
     for i, fold_op in enumerate(fold_ops):
         if part_1 and i > 0:
             break
 
-        new_points = set()
         if fold_op.dim == "x":
-            new_points = fold_x(updated_points, fold_op)
+            paper, x0 = fold_x(paper, fold_op, x0)
         else:
-            new_points = fold_y(updated_points, fold_op)
+            paper, y0 = fold_y(paper, fold_op, y0)
 
-        updated_points = new_points
-
-    return updated_points
+    return paper, x0, y0
 
 
 def part_1(points: List[Point], fold_ops: List[FoldOp]) -> int:
@@ -87,33 +136,36 @@ def part_1(points: List[Point], fold_ops: List[FoldOp]) -> int:
           = 9 - 4 = 5 
     Thus the new point point becomes:
     new_p = Point(p.x, new_y)
+
+    We fold the whole paper at once: the rows below the fold line are
+    flipped and laid over the rows above it, see fold_y.
     """
 
-    new_points = fold(points, fold_ops, True)
-    return len(new_points)
+    paper, _, _ = fold(points, fold_ops, True)
+    return int(paper.cells.sum())
 
 
 def part_2(points: List[Point], fold_ops: List[FoldOp]) -> int:
     """
     Same approach as part_1, we just have to keep using the updated points, 
     which leads to a smaller and smaller grid. 
+    prettytable is only needed for the rendering, so we only import it here.
     """
-    points = fold(points, fold_ops, False)
-    max_x, max_y = boundaries(points)
-    max_x, max_y = max_x + 1, max_y + 1
-    grid = [["" for _ in range(max_x)] for _ in range(max_y)]
+    from prettytable import PrettyTable
 
-    for p in points:
-        grid[p.y][p.x] = "#"
+    paper, x0, y0 = fold(points, fold_ops, False)
+    ys, xs = paper.cells.nonzero()
+    dots = paper.cells[-y0 : ys.max() + 1, -x0 : xs.max() + 1]
 
     p = PrettyTable()
-    for row in grid:
-        p.add_row(row)
+    for row in dots.tolist():
+        p.add_row(["#" if dot else "" for dot in row])
 
     print(p.get_string(header=False, border=False))
 
 
 if __name__ == "__main__":
-    points, fold_ops = read_input("input.txt")
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    points, fold_ops = parse_input("input.txt")
     print(f"part 1: {part_1(points, fold_ops)}")
     print(f"part 2: {part_2(points, fold_ops)}")
@@ -1,5 +1,6 @@
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Mapping
 from pathlib import Path
+from types import MappingProxyType
 from collections import Counter, defaultdict
 
 
@@ -16,8 +17,16 @@ def read_input(filename: str) -> Tuple[str, List[List[str]]]:
     return polymer, rules
 
 
+def parse_input(filename: str = "input.txt") -> Tuple[str, Mapping[str, str]]:
+    """
+    The rules are shared by both parts, so they are read-only.
+    """
+    polymer, rules = read_input(filename)
+    return polymer, MappingProxyType(rules)
+
+
 def get_char_counts(
-    polymer: str, rules: Dict[str, str], num_iter: int
+    polymer: str, rules: Mapping[str, str], num_iter: int
 ) -> Dict[str, int]:
     """Find the character counts for the final polymer. 
 
@@ -75,17 +84,17 @@ def get_char_counts(
     return char_counts
 
 
-def part_1(polymer: str, rules: List[List[str]]) -> int:
-    char_counts = get_char_counts(polymer, rules, 10)
+def part_1(polymer: str, rules: Mapping[str, str], num_iter: int = 10) -> int:
+    char_counts = get_char_counts(polymer, rules, num_iter)
     return (max(char_counts.values()) - min(char_counts.values())) // 2
 
 
-def part_2(polymer: str, rules: List[List[str]]) -> int:
-    char_counts = get_char_counts(polymer, rules, 40)
+def part_2(polymer: str, rules: Mapping[str, str], num_iter: int = 40) -> int:
+    char_counts = get_char_counts(polymer, rules, num_iter)
     return (max(char_counts.values()) - min(char_counts.values())) // 2
 
 
 if __name__ == "__main__":
-    polymer, rules = read_input("input.txt")
+    polymer, rules = parse_input("input.txt")
     print(f"part 1: {part_1(polymer, rules)}")
     print(f"part 2: {part_2(polymer, rules)}")
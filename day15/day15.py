@@ -1,11 +1,13 @@
-from typing import List, Tuple, Dict
+import sys
+from typing import TYPE_CHECKING, List, Tuple
 from pathlib import Path
-from collections import defaultdict, deque
-import numpy as np
 
 from graph import Graph
 from queue import PriorityQueue
 
+if TYPE_CHECKING:
+    from aoc.grid import Grid
+
 
 def read_input(filename: str) -> List[str]:
     path_to_input = Path(__file__).parent / filename
@@ -17,20 +19,29 @@ def read_input(filename: str) -> List[str]:
     return content
 
 
-def within_bounds(grid: List[List[int]], r: int, c: int) -> bool:
-    return r >= 0 and c >= 0 and r < len(grid) and c < len(grid[0])
+def parse_input(filename: str = "input.txt") -> "Grid":
+    from aoc.grid import Grid
+
+    return Grid(read_input(filename)).freeze()
+
 
+def build_graph(grid: "Grid") -> Graph:
+    """
+    The edge into a node weighs its risk level. The risk levels are at least 1
+    and the border of the grid holds 0, so the neighbours that hold 0 are out
+    of bounds.
+    """
+    from aoc.grid import OFFSETS_4
 
-def build_graph(grid: List[List[int]]) -> Graph:
     graph = Graph()
-    directions = [[0, -1], [-1, 0], [0, 1], [1, 0]]
-    for i in range(len(grid)):
-        for j in range(len(grid[0])):
-            for d in directions:
-                r = i + d[0]
-                c = j + d[1]
-                if within_bounds(grid, r, c):
-                    graph.add_edge((i, j), (r, c), grid[r][c])
+    risks = grid.values()
+    for i in range(grid.rows):
+        for j in range(grid.cols):
+            node = grid.index(i, j)
+            for (dr, dc), offset in zip(OFFSETS_4, grid.offsets_4):
+                risk = risks[node + offset]
+                if risk:
+                    graph.add_edge((i, j), (i + dr, j + dc), risk)
     return graph
 
 
@@ -44,7 +55,7 @@ def dijsktra(graph: Graph, start: Tuple[int, int], end: Tuple[int, int]) -> int:
     dist_map[start] = 0
     q = PriorityQueue()
     q.put((0, start))
-    
+
     while not q.empty():
         curr_node_dist, curr_node = q.get()
         neighbours = graph.neighbours(curr_node)
@@ -57,100 +68,39 @@ def dijsktra(graph: Graph, start: Tuple[int, int], end: Tuple[int, int]) -> int:
     return dist_map[end]
 
 
-def part_1(grid: List[List[int]]) -> int:
+def part_1(grid: "Grid") -> int:
     graph = build_graph(grid)
-    return dijsktra(graph, (0, 0), (len(grid) - 1, len(grid[0]) - 1))
-
-
-def update_values(subgrid: List[List[int]]) -> List[List[int]]:
-    new_grid = [[0 for _ in range(len(subgrid))] for _ in range(len(subgrid[0]))]
-    for i in range(len(subgrid)):
-        for j in range(len(subgrid[0])):
-            if subgrid[i][j] == 9:
-                new_grid[i][j] = 1
-            else:
-                new_grid[i][j] = subgrid[i][j] + 1
-
-    return new_grid
-
-def build_small_graph(n: int) -> Dict[Tuple[int, int], List[Tuple[int, int]]]:
-    directions = [[0, -1], [-1, 0], [0, 1], [1, 0]]
-    small_grid = [[0 for _ in range(5)] for _ in range(5)]
-    seen = set()
-    seen.add((0, 0))
-
-    graph = defaultdict(list)
-    for i in range(n):
-        for j in range(n):
-            for d in directions:
-                r = i + d[0]
-                c = j + d[1]
-                if within_bounds(small_grid, r, c) and (r, c) not in seen:
-                    seen.add((r, c))
-                    graph[(i, j)].append((r, c))
-    
-    return graph
+    return dijsktra(graph, (0, 0), (grid.rows - 1, grid.cols - 1))
 
 
-def part_2(grid: List[List[int]], n: int) -> int:
+def part_2(grid: "Grid", n: int) -> int:
     """
-    Overall, we use a level order BFS to generate the new grid. Each of the 
-    n * n copies can be seen as a node in a binary tree where the root of this 
-    binary tree is (0, 0). 
-
-    First we use numpy.tile to create a (rows * 5, cols * 5) new grid. Each 
-    (rows * i, cols * j), for (i, j) in [0, ..., 4] represents a copied subgrid 
-    (i.e node) in the new grid.
-
-    Then we build a graph over each (i, j) entry in the smaller (5 x 5) subgrid
-    to represent the relation between each copied subgrid, i.e:
-    graph = 
-            (0, 0) --> (0, 1) --> (0, 2) ... (0, 4)
-              |          |          |          ...
-             \|/        \|/        \|/
-            (1, 0)     (1, 1)     (1, 2)
-
-            ...         ...         ...        ...
-
-            (4, 0) -->  ...   -->   ...      (4, 4)
-    
-    To update a specific entry in the new grid that has shape 
-    (rows * 5, cols * 5), we retrieve the coordinates from the graph, and 
-    multiply the coordinates (y, x) with rows and cols. To update the values, 
-    we follow the rules specified in the problem description. 
-
-    After we have built the new grid, we can simply use part_1's solution to 
-    get the shortest path. 
-    """
-    rows = len(grid)
-    cols = len(grid[0])
+    The full map is n * n copies of the grid, where the copy at (i, j) has
+    its risk levels incremented i + j times, wrapping around from 9 back to 1.
 
-    new_grid = np.tile(grid, (n, n))
-    graph = build_small_graph(n)
-    q = deque()
-    mat_q = deque()
+    We build it at once: numpy.tile creates the (rows * n, cols * n) map of
+    copies, and we add the number of increments of the copy that each entry
+    belongs to, which is the (n x n) table of i + j with each entry repeated
+    to the size of a copy. Wrapping around is then (risk - 1) % 9 + 1.
 
-    q.append((0, 0))
-    mat_q.append(new_grid[: rows, : cols] )
+    After we have built the new grid, we can simply use part_1's solution to
+    get the shortest path.
+    numpy is only imported here, so that importing this module stays cheap.
+    """
+    import numpy as np
 
-    while q:
-        size = len(mat_q)
-        for _ in range(size):
-            curr = q.popleft()
-            sub_grid = mat_q.popleft()
+    from aoc.grid import Grid
 
-            # get the indices of the new_grid that we wanto update
-            y, x = curr[0] * rows, curr[1] * cols 
-            new_grid[y : y + rows, x : x + cols] = sub_grid
-            incremented_sub_grid = update_values(sub_grid)
-            for neighbour in graph[curr]:
-                q.append(neighbour)
-                mat_q.append(incremented_sub_grid)
+    rows, cols = grid.shape
+    copies = np.add.outer(np.arange(n), np.arange(n))
+    increments = copies.repeat(rows, axis=0).repeat(cols, axis=1)
+    new_grid = (np.tile(grid.cells, (n, n)) + increments - 1) % 9 + 1
+    return part_1(Grid(new_grid))
 
-    return part_1(new_grid)
 
 if __name__ == "__main__":
-    grid = read_input("input.txt")
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    grid = parse_input("input.txt")
     print(f"part 1: {part_1(grid)}")
     print(f"part 2: {part_2(grid, 5)}")
 
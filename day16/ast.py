@@ -3,18 +3,19 @@ from typing import Union
 
 
 class Literal:
-    def __init__(self, packet):
-        self.header = packet[:6]
-        self.body = packet[6:]
-
-    def to_digit(self):
-        value = get_value(self.body, "")
-        return int(value, 2)
-
-    def get_body_value(self, body, acc):
-        """
-        This function returns the binary value of the literal. 
-        """
+    """
+    A literal packet. The bits of the packet are decoded once, and we only
+    keep its version and its value rather than copies of the bits.
+    """
+
+    __slots__ = ("version", "value")
+
+    def __init__(self, packet: str):
+        self.version = int(packet[:3], 2)
+        self.value = int(get_value(packet[6:], ""), 2)
+
+    def to_digit(self) -> int:
+        return self.value
 
 
 def get_value(body: str, acc: str) -> str:
@@ -17,6 +17,13 @@ def hex_to_bin(hex: str) -> str:
     return "".join(bin(int(c, 16))[2:].zfill(4) for c in hex if c != "\n")
 
 
+def parse_input(filename: str = "input.txt") -> str:
+    """
+    Both parts work on the binary representation of the transmission.
+    """
+    return hex_to_bin(read_input(filename))
+
+
 def get_length_type_value(body: str, length_type_id: str) -> str:
     if length_type_id == "1":
         return body[:11]
@@ -148,17 +155,15 @@ def evaluate(packet: str) -> int:
     return evaluate_ast(root)
 
 
-def part_1(input: str) -> int:
-    as_bin = hex_to_bin(input)
+def part_1(as_bin: str) -> int:
     return get_version_sum(as_bin, 0)
 
 
-def part_2(hex_input: str) -> int:
-    as_bin = hex_to_bin(hex_input)
+def part_2(as_bin: str) -> int:
     return evaluate(as_bin)
 
 
 if __name__ == "__main__":
-    content = read_input("input.txt")
+    content = parse_input("input.txt")
     print(f"part 1: {part_1(content)}")
     print(f"part 2: {part_2(content)}")